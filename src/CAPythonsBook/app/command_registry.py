@@ -1,9 +1,21 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from app.interfaces import Command
 
 # Реєстр для зберігання команд
 command_registry: Dict[str, Command] = {}
 
+# Назва команди -> (клас команди, чи працює вона з нотатками)
+dispatch_table: Dict[str, Tuple[Command, bool]] = {}
+
+# Готовий текст довідки для кожної мови; скидається при реєстрації команди
+help_cache: Dict[str, str] = {}
+
+# Рядки довідки (команда, параметри, опис) для кожної мови
+_help_rows: Dict[str, List[Tuple[str, str, str]]] = {}
+
+# Кортеж назв усіх команд; скидається при реєстрації команди
+_command_names: Optional[Tuple[str, ...]] = None
+
 
 def register_command(name: str):
     """
@@ -11,15 +23,51 @@ def register_command(name: str):
     """
 
     def decorator(command: Command):
+        global _command_names
         command_registry[name] = command
+        _command_names = None
+        dispatch_table[name] = (command, "note" in name)
+        help_cache.clear()
+        _help_rows.clear()
         return command
 
     return decorator
 
 
+def command_names() -> Tuple[str, ...]:
+    """
+    Повертає назви всіх зареєстрованих команд (той самий кортеж, доки
+    не зареєстровано нову команду).
+    """
+    global _command_names
+    if _command_names is None:
+        _command_names = tuple(command_registry)
+    return _command_names
+
+
 def get_command(command_name: str) -> Optional[Command]:
     """
     Повертає команду (екземпляр відповідного класу), що відповідає імені ("command_name") яке було передане.
     Якщо назва команди відсутня (команда не знайдена) — повертає 'None'.
     """
     return command_registry.get(command_name)
+
+
+def help_rows(language: str) -> List[Tuple[str, str, str]]:
+    """
+    Повертає рядки довідки (назва, приклад, опис) для мови "language".
+    Якщо опису мовою немає — використовується англійський.
+    """
+    rows = _help_rows.get(language)
+    if rows is None:
+        rows = [
+            (
+                command_name,
+                command.example.get(language, ""),
+                command.description.get(language)
+                or command.description.get("en", "No description available."),
+            )
+            for command_name, command in command_registry.items()
+        ]
+        _help_rows[language] = rows
+    return rows
@@ -1,52 +1,161 @@
+import hashlib
 import json
 import os
+import sys
 import uuid
 import re
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from collections import UserDict
-from colorama import Fore, Style
+from datetime import date, datetime
+from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from itertools import chain
+from weakref import WeakValueDictionary, ref
+from presentation.colors import Fore, Style
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_GREEN, _RESET = Fore.GREEN, Style.RESET_ALL
+
+# Notes are read and written as UTF-8 bytes; orjson is used when it is
+# installed and the standard json module otherwise.
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
+
+class _UUIDPool:
+    # Reads random bytes for many UUIDs with one os.urandom() call instead of
+    # one call per uuid.uuid4().
+    BATCH_SIZE = 1024
+
+    def __init__(self):
+        self._buf = b""
+        self._off = 0
+
+    def next(self) -> uuid.UUID:
+        if self._off >= len(self._buf):
+            self._buf = os.urandom(16 * self.BATCH_SIZE)
+            self._off = 0
+        chunk = self._buf[self._off : self._off + 16]
+        self._off += 16
+        return uuid.UUID(bytes=chunk, version=4)
+
+
+_uuid_pool = _UUIDPool()
+
+
+class _QueryCache:
+    # Results of the most recent searches, valid until the book's version
+    # changes; repeated queries then skip the scan entirely.
+    SIZE = 16
+
+    def __init__(self):
+        self._version: Optional[int] = None
+        self._results: "OrderedDict[str, list]" = OrderedDict()
+
+    def get(self, version: int, query: str) -> Optional[list]:
+        if version != self._version:
+            self._version = version
+            self._results.clear()
+            return None
+        results = self._results.get(query)
+        if results is not None:
+            self._results.move_to_end(query)
+        return results
+
+    def put(self, query: str, results: list) -> None:
+        self._results[query] = results
+        if len(self._results) > self.SIZE:
+            self._results.popitem(last=False)
 
 
 class Field:
+    __slots__ = ("value", "_str", "__weakref__")
+
     def __init__(self, value: str):
         self.value = value
+        self._str = str(value)
+
+    def __getnewargs__(self):
+        # The pooled subclasses need their value in __new__, so pickle and
+        # deepcopy have to pass it back in.
+        return (self.value,)
 
     def __str__(self):
-        return str(self.value)
+        return self._str
 
     def __eq__(self, other):
-        return self.value == other.value
+        return self.value is other.value or self.value == other.value
 
     def to_dict(self):
         return self.value
 
 
 class Name(Field):
+    __slots__ = ()
+    # Every command builds a Name just to look a contact up, so equal names
+    # share one instance, like phones and emails below.
+    _pool: "WeakValueDictionary[str, Name]" = WeakValueDictionary()
+
+    def __new__(cls, value: str):
+        name = cls._pool.get(value)
+        if name is None:
+            if not value:
+                raise ValueError("Name cannot be empty.")
+            name = super().__new__(cls)
+            cls._pool[value] = name
+        return name
+
     def __init__(self, value: str):
-        if not value:
-            raise ValueError("Name cannot be empty.")
-        super().__init__(value)
+        super().__init__(sys.intern(value))
 
 
 class Phone(Field):
-    def __init__(self, value: str):
-        phone_pattern = re.compile(r"^\+?[1-9]\d{9,14}$")
-        if not phone_pattern.match(value):
-            raise ValueError("Phone number must be 10-15 digits and may start with +")
-        super().__init__(value)
+    __slots__ = ()
+    PHONE_REGEX = re.compile(r"^\+?[1-9]\d{9,14}$")
+    # Phones are never mutated, so equal numbers share one validated instance
+    # for as long as any record still holds it.
+    _pool: "WeakValueDictionary[str, Phone]" = WeakValueDictionary()
+
+    def __new__(cls, value: str):
+        phone = cls._pool.get(value)
+        if phone is None:
+            if not cls.PHONE_REGEX.match(value):
+                raise ValueError(
+                    "Phone number must be 10-15 digits and may start with +"
+                )
+            phone = super().__new__(cls)
+            cls._pool[value] = phone
+        return phone
 
 
 class Email(Field):
+    __slots__ = ()
     EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+    _pool: "WeakValueDictionary[str, Email]" = WeakValueDictionary()
 
-    def __init__(self, value: str):
-        if not self.EMAIL_REGEX.match(value):
-            raise ValueError("Invalid email format")
-        super().__init__(value)
+    def __new__(cls, value: str):
+        email = cls._pool.get(value)
+        if email is None:
+            if not cls.EMAIL_REGEX.match(value):
+                raise ValueError("Invalid email format")
+            email = super().__new__(cls)
+            cls._pool[value] = email
+        return email
 
 
 class Address(Field):
+    __slots__ = ()
+
     def __init__(self, value: List[str]):
         if not value:
             raise ValueError("Invalid address format")
@@ -55,164 +164,596 @@ class Address(Field):
 
 
 class Birthday(Field):
+    __slots__ = ("date",)
+    DATE_REGEX = re.compile(r"^(\d{2})\.(\d{2})\.(\d{4})$")
+
     def __init__(self, value: str):
         try:
-            datetime.strptime(value, "%d.%m.%Y")
+            self.date = self.parse(value)
         except ValueError:
             raise ValueError("Invalid date format. Use DD.MM.YYYY")
         super().__init__(value)
 
+    @classmethod
+    def parse(cls, value: str) -> date:
+        # strptime is slow, so the canonical DD.MM.YYYY form is parsed by hand
+        # and only unusual inputs (e.g. single-digit days) go through it.
+        match = cls.DATE_REGEX.match(value)
+        if match:
+            day, month, year = match.groups()
+            return date(int(year), int(month), int(day))
+        return datetime.strptime(value, "%d.%m.%Y").date()
+
 
 class Record:
+    __slots__ = ("id", "name", "fields", "_search_blob", "_owners", "_positions", "_str")
+
     def __init__(self, name: Name, **fields: Any):
-        self.id = uuid.uuid4()
+        self.id = _uuid_pool.next()
         self.name = name
         self.fields: Dict[str, Field] = {"name": name}
         self.fields.update(fields)
+        self._search_blob: Optional[str] = None
+        # Weak references to the books holding the record; a record can be in
+        # more than one book and each of them must see its changes.
+        self._owners: Tuple["ref[AddressBook]", ...] = ()
+        self._positions: Dict[str, Dict[str, int]] = {}
+        self._str: Optional[str] = None
+
+    def __getstate__(self):
+        # The owning books are left out; adding the copy to a book adopts it.
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["_owners"] = ()
+        return None, state
+
+    def _owner_books(self) -> List["AddressBook"]:
+        books = []
+        for owner in self._owners:
+            book = owner()
+            if book is not None:
+                books.append(book)
+        return books
+
+    def _adopt(self, book: "AddressBook"):
+        if not any(owner() is book for owner in self._owners):
+            self._owners += (ref(book),)
+
+    def _release(self, book: "AddressBook"):
+        # Books are compared by identity: two books with the same contacts are
+        # equal as dicts.
+        self._owners = tuple(
+            ref(other) for other in self._owner_books() if other is not book
+        )
+
+    def _invalidate(self):
+        self._search_blob = None
+        self._str = None
+        for book in self._owner_books():
+            book._record_changed(self)
 
     def add_field(self, field_name: str, field: Field):
         self.fields[field_name] = field
+        self._positions.pop(field_name, None)
+        self._invalidate()
 
     def remove_field(self, field_name: str):
         if field_name in self.fields:
             del self.fields[field_name]
+            self._positions.pop(field_name, None)
+            self._invalidate()
 
     def edit_field(self, field_name: str, new_field: Field):
         if field_name in self.fields:
             self.fields[field_name] = new_field
-
-    def matches_criteria(self, keyword: str) -> bool:
-        for field in self.fields.values():
-            if keyword.lower() in str(field).lower():
-                return True
-        return False
+            self._positions.pop(field_name, None)
+            self._invalidate()
+
+    def _value_positions(self, field_name: str) -> Dict[str, int]:
+        # value -> index of its first occurrence in the list field. Built on
+        # first use because FileStorage fills ``fields`` directly.
+        positions = self._positions.get(field_name)
+        if positions is None:
+            positions = {}
+            for index, field in enumerate(self.fields.get(field_name, ())):
+                positions.setdefault(field.value, index)
+            self._positions[field_name] = positions
+        return positions
+
+    def has_phone(self, phone: str) -> bool:
+        return phone in self._value_positions("phones")
+
+    def has_email(self, email: str) -> bool:
+        return email in self._value_positions("emails")
+
+    def search_blob(self) -> str:
+        # Every field value lowercased once and joined with newlines, which a
+        # search keyword never contains, so a match cannot span two values.
+        if self._search_blob is None:
+            values = []
+            for value in self.fields.values():
+                if type(value) is list:
+                    values.extend(str(item).lower() for item in value)
+                else:
+                    values.append(str(value).lower())
+            self._search_blob = "\n".join(values)
+        return self._search_blob
+
+    def matches_criteria(self, keyword_lower: str) -> bool:
+        # The caller lowercases the keyword once per search, not once per record.
+        return keyword_lower in self.search_blob()
 
     def add_phone(self, phone: Phone):
         if "phones" not in self.fields:
             self.fields["phones"] = []
+        self._value_positions("phones").setdefault(
+            phone.value, len(self.fields["phones"])
+        )
         self.fields["phones"].append(phone)
+        self._invalidate()
+
+    def replace_phone(self, old_phone: Phone, new_phone: Phone):
+        self._replace_item("phones", old_phone, new_phone)
 
     def add_email(self, email: Email):
         if "emails" not in self.fields:
             self.fields["emails"] = []
+        self._value_positions("emails").setdefault(
+            email.value, len(self.fields["emails"])
+        )
         self.fields["emails"].append(email)
+        self._invalidate()
+
+    def replace_email(self, old_email: Email, new_email: Email):
+        self._replace_item("emails", old_email, new_email)
+
+    def _replace_item(self, field_name: str, old_field: Field, new_field: Field):
+        items = self.fields[field_name]
+        positions = self._value_positions(field_name)
+        index = positions.get(old_field.value)
+        if index is None:
+            raise ValueError(f"{old_field.value} is not in {field_name}")
+        items[index] = new_field
+        if len(positions) == len(items):
+            # No duplicates, so the map can be patched in place.
+            del positions[old_field.value]
+            positions[new_field.value] = min(
+                index, positions.get(new_field.value, index)
+            )
+        else:
+            self._positions.pop(field_name, None)
+        self._invalidate()
 
     def to_dict(self):
-        return {
-            k: [f.to_dict() for f in v] if isinstance(v, list) else v.to_dict()
-            for k, v in self.fields.items()
-        }
-
-    def __str__(self):
-        field_strings = []
+        # Field.to_dict() is just .value; reading it directly skips a method
+        # call per field on every save.
+        result = {}
         for key, value in self.fields.items():
-            if isinstance(value, list):
-                field_str = "; ".join(str(v) for v in value)
+            if type(value) is list:
+                result[key] = [field.value for field in value]
             else:
-                field_str = str(value)
-            field_strings.append(f"{key}: {field_str}")
-        field_str = "; ".join(field_strings)
-        return f"{Fore.GREEN}{field_str}{Style.RESET_ALL}"
+                result[key] = value.value
+        return result
 
+    def __str__(self):
+        if self._str is None:
+            field_strings = []
+            for key, value in self.fields.items():
+                if type(value) is list:
+                    field_str = "; ".join(map(str, value))
+                else:
+                    field_str = str(value)
+                field_strings.append(f"{key}: {field_str}")
+            field_str = "; ".join(field_strings)
+            self._str = f"{_GREEN}{field_str}{_RESET}"
+        return self._str
+
+
+@lru_cache(maxsize=32)
+def _birthday_window(today: date, days: int) -> Dict[Tuple[int, int], str]:
+    # Maps every (month, day) of the next `days` days to its formatted date, so
+    # that checking a record is a single dictionary lookup. The result only
+    # depends on its arguments, so repeated queries on the same day reuse it.
+    window = {}
+    start = today.toordinal()
+    for ordinal in range(start, start + min(days, 366) + 1):
+        day = date.fromordinal(ordinal)
+        window.setdefault((day.month, day.day), day.strftime("%d.%m.%Y"))
+    return window
+
+
+class AddressBook(dict):
+    def __init__(self, records: Optional[Dict[uuid.UUID, Record]] = None):
+        super().__init__()
+        # Secondary index: contact name -> record, kept in sync by
+        # __setitem__/__delitem__ so that find_by_name is a single hash probe.
+        self._by_name: Dict[str, Record] = {}
+        # Bumped on every change to the book or to one of its records, so that
+        # derived data can be cached until the next change.
+        self.version = 0
+        self._upcoming_cache = None
+        # Trigram -> records whose search blob contains it, and each record's
+        # insertion number, to return matches in book order. Built by the
+        # first search that needs them, then kept up to date record by record.
+        self._postings: Optional[Dict[str, set]] = None
+        self._record_trigrams: Dict[Record, set] = {}
+        self._order: Dict[Record, int] = {}
+        self._next_order = 0
+        self._birthday_index = None
+        self._search_cache = _QueryCache()
+        self._str_cache: Optional[Tuple[int, str]] = None
+        self._field_values: Dict[str, List[str]] = {}
+        self._field_values_version = -1
+        if records:
+            # Bulk load: fill the dict and build the name index in one pass
+            # instead of going through __setitem__ for every record.
+            super().update(records)
+            for record in records.values():
+                self._by_name.setdefault(record.name.value, record)
+                record._adopt(self)
+
+    def __setitem__(self, record_id: uuid.UUID, record: Record):
+        previous = self.get(record_id)
+        if previous is not None:
+            self._unindex(previous)
+            previous._release(self)
+        super().__setitem__(record_id, record)
+        self._by_name.setdefault(record.name.value, record)
+        record._adopt(self)
+        if self._postings is not None:
+            # A replaced record keeps its key's place in the book.
+            if previous is not None:
+                order = self._order.pop(previous)
+                self._unindex_trigrams(previous)
+            else:
+                order = self._next_order
+                self._next_order += 1
+            self._order[record] = order
+            self._index_trigrams(record)
+        self.version += 1
+
+    def __delitem__(self, record_id: uuid.UUID):
+        record = self[record_id]
+        super().__delitem__(record_id)
+        self._unindex(record)
+        record._release(self)
+        if self._postings is not None:
+            del self._order[record]
+            self._unindex_trigrams(record)
+        self.version += 1
+
+    # dict's own pop, popitem, clear, update and setdefault do not go through
+    # __setitem__/__delitem__, so they are routed there to keep the name index,
+    # the record owners and the version in step.
+    def pop(self, record_id: uuid.UUID, *default):
+        if record_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(record_id)
+        record = self[record_id]
+        del self[record_id]
+        return record
+
+    def popitem(self) -> Tuple[uuid.UUID, Record]:
+        if not self:
+            raise KeyError("popitem(): address book is empty")
+        record_id = next(reversed(self))
+        return record_id, self.pop(record_id)
+
+    def clear(self):
+        for record in self.values():
+            record._release(self)
+        super().clear()
+        self._by_name.clear()
+        self._postings = None
+        self._record_trigrams = {}
+        self._order = {}
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        for record_id, record in dict(*args, **kwargs).items():
+            self[record_id] = record
+
+    def setdefault(self, record_id: uuid.UUID, record: Optional[Record] = None):
+        if record_id not in self:
+            self[record_id] = record
+        return self[record_id]
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Pickle restores a dict subclass's items before its state, so the
+        # records are re-added through __setitem__ to a freshly built book.
+        return type(self), (), None, None, iter(self.items())
+
+    def _unindex(self, record: Record):
+        name = record.name.value
+        if self._by_name.get(name) is record:
+            del self._by_name[name]
+            for other in self.values():
+                if other is not record and other.name.value == name:
+                    self._by_name[name] = other
+                    break
 
-class AddressBook(UserDict):
     def add_record(self, record: Record):
-        self.data[record.id] = record
+        self[record.id] = record
 
     def delete(self, record_id: uuid.UUID):
-        if record_id in self.data:
-            del self.data[record_id]
+        if record_id in self:
+            del self[record_id]
         else:
             raise KeyError(f"Record with ID '{record_id}' not found")
 
-    def find_by_name(self, name: Name) -> Optional[Record]:
-        for record in self.data.values():
-            if record.fields["name"].value == name.value:
-                return record
-        return None
+    def rename(self, record: Record, new_name: Name):
+        # Every book holding the record looks it up by name.
+        books = record._owner_books() or [self]
+        for book in books:
+            book._unindex(record)
+        record.name = new_name
+        record.edit_field("name", new_name)
+        for book in books:
+            book._by_name.setdefault(new_name.value, record)
 
-    def get_upcoming_birthdays(self, set_number: int) -> List[Dict[str, str]]:
-        today = datetime.today().date()
-        upcoming_birthdays = []
-
-        for record in self.data.values():
-            if "birthday" in record.fields:
-                birthday = datetime.strptime(
-                    record.fields["birthday"].value, "%d.%m.%Y"
-                ).date()
-                birthday_this_year = birthday.replace(year=today.year)
-                if birthday_this_year < today:
-                    birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-
-                day_difference = (birthday_this_year - today).days
-                if 0 <= day_difference <= set_number:
-                    congratulation_date = birthday_this_year
-                    upcoming_birthdays.append(
-                        {
-                            "name": record.fields["name"].value,
-                            "congratulation_date": congratulation_date.strftime(
-                                "%d.%m.%Y"
-                            ),
-                        }
+    def find_by_name(self, name: Name) -> Optional[Record]:
+        return self._by_name.get(name.value)
+
+    def field_values(self, field_name: str) -> List[str]:
+        # Every value of the field across the book, flattened, for
+        # autocompletion. Cached until the next change; do not mutate.
+        if self._field_values_version != self.version:
+            self._field_values = {}
+            self._field_values_version = self.version
+        values = self._field_values.get(field_name)
+        if values is None and field_name == "name":
+            # Every record has a name, held in its own slot.
+            values = [record.name.value for record in self.values()]
+            self._field_values[field_name] = values
+        elif values is None:
+            # One flat column per field: list fields are flattened in C by
+            # chain.from_iterable rather than by a nested Python loop.
+            column = [
+                record.fields[field_name]
+                for record in self.values()
+                if field_name in record.fields
+            ]
+            if column and type(column[0]) is list:
+                values = [item.value for item in chain.from_iterable(column)]
+            else:
+                values = [field.value for field in column]
+            self._field_values[field_name] = values
+        return values
+
+    def _record_changed(self, record: Record):
+        # Called by a record of this book after one of its fields changed.
+        if self._postings is not None:
+            self._unindex_trigrams(record)
+            self._index_trigrams(record)
+        self.version += 1
+
+    def _index_trigrams(self, record: Record):
+        blob = record.search_blob()
+        trigrams = {blob[i : i + 3] for i in range(len(blob) - 2)}
+        self._record_trigrams[record] = trigrams
+        postings = self._postings
+        for trigram in trigrams:
+            records = postings.get(trigram)
+            if records is None:
+                postings[trigram] = {record}
+            else:
+                records.add(record)
+
+    def _unindex_trigrams(self, record: Record):
+        postings = self._postings
+        for trigram in self._record_trigrams.pop(record, ()):
+            records = postings[trigram]
+            records.discard(record)
+            if not records:
+                del postings[trigram]
+
+    def _trigram_index(self) -> Dict[str, set]:
+        if self._postings is None:
+            self._postings = {}
+            for order, record in enumerate(self.values()):
+                self._order[record] = order
+                self._index_trigrams(record)
+            self._next_order = len(self._order)
+        return self._postings
+
+    def search(self, keyword_lower: str) -> List[Record]:
+        results = self._search_cache.get(self.version, keyword_lower)
+        if results is None:
+            results = self._search(keyword_lower)
+            self._search_cache.put(keyword_lower, results)
+        return list(results)
+
+    def _search(self, keyword_lower: str) -> List[Record]:
+        if len(keyword_lower) < 3:
+            return [r for r in self.values() if keyword_lower in r.search_blob()]
+        index = self._trigram_index()
+        postings = []
+        for i in range(len(keyword_lower) - 2):
+            records = index.get(keyword_lower[i : i + 3])
+            if not records:
+                return []
+            postings.append(records)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        # Sharing every trigram does not imply a match, so each candidate is
+        # still checked; sorting keeps the book's insertion order.
+        return [
+            record
+            for record in sorted(candidates, key=self._order.__getitem__)
+            if keyword_lower in record.search_blob()
+        ]
+
+    def _birthdays_by_day(self) -> Dict[Tuple[int, int], List[Tuple[int, str]]]:
+        # (month, day) -> [(position in the book, name)], rebuilt once per version.
+        if self._birthday_index is None or self._birthday_index[0] != self.version:
+            index: Dict[Tuple[int, int], List[Tuple[int, str]]] = defaultdict(list)
+            for position, record in enumerate(self.values()):
+                birthday = record.fields.get("birthday")
+                # A stored date that no longer parses loads as a plain Field.
+                if isinstance(birthday, Birthday):
+                    born = birthday.date
+                    index[(born.month, born.day)].append(
+                        (position, record.name.value)
                     )
+            self._birthday_index = (self.version, index)
+        return self._birthday_index[1]
 
-        return upcoming_birthdays
+    def get_upcoming_birthdays(self, set_number: int) -> List[Dict[str, str]]:
+        today = date.today()
+        cache_key = (today, set_number, self.version)
+        if self._upcoming_cache and self._upcoming_cache[0] == cache_key:
+            return list(self._upcoming_cache[1])
+
+        # Probe the index once per day of the window instead of visiting every
+        # record; positions restore the book's order.
+        index = self._birthdays_by_day()
+        window = _birthday_window(today, set_number)
+        matches = []
+        for month_day, congratulation_date in window.items():
+            for position, name in index.get(month_day, ()):
+                matches.append((position, name, congratulation_date))
+        matches.sort()
+        upcoming_birthdays = [
+            {"name": name, "congratulation_date": congratulation_date}
+            for _, name, congratulation_date in matches
+        ]
+
+        self._upcoming_cache = (cache_key, upcoming_birthdays)
+        return list(upcoming_birthdays)
 
     def __str__(self):
-        return "\n".join(str(record) for record in self.data.values())
+        # Records cache their own rendering; the joined listing is cached
+        # until the next change to the book.
+        if self._str_cache is None or self._str_cache[0] != self.version:
+            text = "\n".join(str(record) for record in self.values())
+            self._str_cache = (self.version, text)
+        return self._str_cache[1]
 
 
 class NotesBook:
-    def __init__(self, file_name: str = "notes.json") -> None:
+    def __init__(self, file_name: str = "notes.jsonl") -> None:
         self.file_name = file_name
-        self.notes: List[Dict[str, Any]] = self.load_notes()
+        self._dirty = False
+        self._saved_digest: Optional[bytes] = None
+        # Bumped whenever a note's searchable content changes.
+        self._version = 0
+        self._search_cache = _QueryCache()
+        self.notes: Dict[str, Dict[str, Any]] = {
+            note["id"]: note for note in self.load_notes()
+        }
+        self._rebuild_indexes()
 
     def load_notes(self) -> List[Dict[str, Any]]:
+        # One JSON object per line; a later line for the same id wins.
         if os.path.exists(self.file_name):
-            with open(self.file_name, "r", encoding="utf-8") as file:
-                return json.load(file)
+            with open(self.file_name, "rb") as file:
+                return [_json_loads(line) for line in file if line.strip()]
+        # Notes from the old single-document notes.json are migrated on the
+        # next write.
+        legacy_name = os.path.splitext(self.file_name)[0] + ".json"
+        if legacy_name != self.file_name and os.path.exists(legacy_name):
+            with open(legacy_name, "rb") as file:
+                self._dirty = True
+                return _json_loads(file.read())
         return []
 
     def save_notes(self) -> None:
-        with open(self.file_name, "w", encoding="utf-8") as file:
-            json.dump(self.notes, file, ensure_ascii=False, indent=4)
+        payload = b"".join(self._dump_note(note) for note in self.notes.values())
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest != self._saved_digest or not os.path.exists(self.file_name):
+            # Write to a temporary file first so a crash never leaves a
+            # truncated notes file behind.
+            tmp_name = f"{self.file_name}.tmp"
+            with open(tmp_name, "wb") as file:
+                file.write(payload)
+            os.replace(tmp_name, self.file_name)
+            self._saved_digest = digest
+        self._dirty = False
+
+    def _append_note(self, note: Dict[str, Any]) -> None:
+        # A pending full rewrite will include the note anyway.
+        if self._dirty:
+            self.save_notes()
+            return
+        with open(self.file_name, "ab") as file:
+            file.write(self._dump_note(note))
+        self._saved_digest = None
+
+    @staticmethod
+    def _dump_note(note: Dict[str, Any]) -> bytes:
+        return _json_dumps(note) + b"\n"
+
+    @staticmethod
+    def _search_blob(note: Dict[str, Any]) -> bytes:
+        # A search keyword never contains a newline, so joining with one keeps
+        # matches from spanning two fields. UTF-8 is self-synchronising, so a
+        # byte match is exactly a text match and bytes.find can use memchr.
+        text = "\n".join([note["title"], note["text"], *note["tags"]]).lower()
+        return text.encode("utf-8", "surrogatepass")
+
+    def _index_note(self, note: Dict[str, Any]) -> None:
+        for tag in note["tags"]:
+            self._tag_index[tag][note["id"]] = note
+        self._search_blobs[note["id"]] = (note, self._search_blob(note))
+        self._version += 1
+
+    def _unindex_note(self, note: Dict[str, Any]) -> None:
+        for tag in note["tags"]:
+            self._tag_index[tag].pop(note["id"], None)
+        del self._search_blobs[note["id"]]
+        self._version += 1
+
+    def _rebuild_indexes(self) -> None:
+        self._tag_index: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        # id -> (note, blob), so a search touches a single dict.
+        self._search_blobs: Dict[str, Tuple[Dict[str, Any], bytes]] = {}
+        for note in self.notes.values():
+            self._index_note(note)
 
     def add_note(self, title: str, text: str, tags: List[str]) -> None:
-        note_id = str(uuid.uuid4())
+        note_id = str(_uuid_pool.next())
         new_note = {"id": note_id, "title": title, "text": text, "tags": tags}
-        self.notes.append(new_note)
-        self.save_notes()
+        self.notes[note_id] = new_note
+        self._index_note(new_note)
+        self._append_note(new_note)
 
     def edit_note(self, note_id: str, new_title: str, new_text: str) -> None:
-        for note in self.notes:
-            if note["id"] == note_id:
-                note["title"] = new_title
-                note["text"] = new_text
-                self.save_notes()
-                return
-        raise KeyError(f"Note with ID '{note_id}' does not exist.")
+        note = self.notes.get(note_id)
+        if note is None:
+            raise KeyError(f"Note with ID '{note_id}' does not exist.")
+        note["title"] = new_title
+        note["text"] = new_text
+        self._search_blobs[note_id] = (note, self._search_blob(note))
+        self._version += 1
+        self.save_notes()
 
     def delete_note(self, note_id: str) -> None:
-        self.notes = [note for note in self.notes if note["id"] != note_id]
-        self.save_notes()
+        note = self.notes.pop(note_id, None)
+        if note is not None:
+            self._unindex_note(note)
+            self.save_notes()
 
     def search_notes(self, keyword: str) -> List[Dict[str, Any]]:
-        results = []
-        for note in self.notes:
-            if (
-                keyword.lower() in note["title"].lower()
-                or keyword.lower() in note["text"].lower()
-                or any(keyword.lower() in tag.lower() for tag in note["tags"])
-            ):
-                results.append(note)
-        return results
+        needle = keyword.lower().encode("utf-8", "surrogatepass")
+        results = self._search_cache.get(self._version, needle)
+        if results is None:
+            results = [
+                note
+                for note, blob in self._search_blobs.values()
+                if blob.find(needle) != -1
+            ]
+            self._search_cache.put(needle, results)
+        return list(results)
 
     def find_notes_with_same_tags(self, tag: str) -> List[Dict[str, Any]]:
-        search_tag = f"#{tag}"
-        tagged_notes = [note for note in self.notes if search_tag in note["tags"]]
+        tagged_notes = self._tag_index.get(f"#{tag}")
 
         if tagged_notes:
-            return tagged_notes
+            return list(tagged_notes.values())
         else:
             raise ValueError(f"No notes found with tag '{tag}'.")
 
@@ -220,7 +761,7 @@ class NotesBook:
         if not self.notes:
             raise ValueError("No notes available.")
         else:
-            return self.notes
+            return list(self.notes.values())
 
 
 def update_field_types():
@@ -231,3 +772,13 @@ def update_field_types():
 
 
 FIELD_TYPES = update_field_types()
+
+# Key each field type is stored under in Record.fields. Phones and emails are
+# lists under the plural key; the others hold a single field.
+FIELD_KEYS = {
+    Name: "name",
+    Phone: "phones",
+    Email: "emails",
+    Address: "address",
+    Birthday: "birthday",
+}
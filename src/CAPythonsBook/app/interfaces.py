@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from app.entities import Record, Field, AddressBook, Name, NotesBook
 from presentation.messages import Message
 
 
 class Command(ABC):
     description = ""
+    example: Dict[str, str] = {}
+    # Number of arguments execute() takes: an exact count, a (min, max) range
+    # with None for "no limit", or None to let execute() check them itself.
+    arity: Optional[int | Tuple[int, Optional[int]]] = None
     exit_command_flag = False
 
     def __init__(
@@ -14,20 +18,29 @@ class Command(ABC):
     ):
         self.book_type = book_type
 
+    @classmethod
+    def accepts(cls, arg_count: int) -> bool:
+        arity = cls.arity
+        if arity is None:
+            return True
+        if isinstance(arity, int):
+            return arg_count == arity
+        minimum, maximum = arity
+        return arg_count >= minimum and (maximum is None or arg_count <= maximum)
+
     @abstractmethod
     def execute(self, *args: str, **kwargs) -> None:
         pass
 
 
 class FieldCommand(Command, ABC):
+    arity = (2, None)
+
     @abstractmethod
     def execute_field(self, record: Record, field: Field, **kwargs) -> None:
         pass
 
     def execute(self, *args: str) -> None:
-        if len(args) < 2:
-            Message.error("incorrect_arguments")
-            return
         name, *field_args = args
         # print(f"Arguments received: name={name}, field_args={field_args}")  # Debugging
         record = self.book_type.find_by_name(Name(name))
@@ -11,17 +11,27 @@ from app.entities import (
     Email,
     Address,
 )
-from infrastructure.storage import FileStorage
 from presentation.messages import Message
-from app.command_registry import register_command, get_command
+from app.command_registry import register_command
 from app.settings import Settings
-from typing import Callable
-from colorama import Fore, Style
+import sys
+from typing import Callable, Dict
+from presentation.colors import Fore, Style
 
 
 # Initialize settings
 settings = Settings()
 
+NOTE_SEPARATOR = "-" * 40
+
+
+def format_notes(notes) -> str:
+    """Renders notes as one string so a listing costs a single write."""
+    return "".join(
+        f"\nID: {note['id']}\nTitle: {note['title']}\nText: {note['text']}\nTags: {', '.join(note['tags'])}\n\n{NOTE_SEPARATOR}\n"
+        for note in notes
+    )
+
 # Language mapping
 LANGUAGE_MAP = {
     "en": {"en": "English", "ua": "Ukrainian", "de": "German"},
@@ -30,6 +40,18 @@ LANGUAGE_MAP = {
 }
 
 
+_RED, _MAGENTA, _RESET = Fore.RED, Fore.MAGENTA, Style.RESET_ALL
+_ERROR_TEMPLATE = f"{_RED}{{headline}}\n{_MAGENTA}{{error}}{_RESET}"
+
+# Error headline per exception type; anything else is "unexpected".
+ERROR_HEADLINES = {
+    TypeError: "Error: Incorrect command.",
+    ValueError: "Error: Incorrect arguments.",
+    KeyError: "Error: Contact not found.",
+    IndexError: "Error: Index out of range.",
+}
+
+
 # Decorator for handling errors in command functions
 def input_error(handler: Callable) -> Callable:
     """Decorator for handling errors in command functions."""
@@ -37,38 +59,43 @@ def input_error(handler: Callable) -> Callable:
     def wrapper(*args, **kwargs):
         try:
             return handler(*args, **kwargs)
-        except TypeError as e:
-            print(
-                f"{Fore.RED}Error: Incorrect command.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
-            )
-        except ValueError as e:
-            print(
-                f"{Fore.RED}Error: Incorrect arguments.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
-            )
-        except KeyError as e:
-            print(
-                f"{Fore.RED}Error: Contact not found.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
-            )
-        except IndexError as e:
-            print(
-                f"{Fore.RED}Error: Index out of range.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
-            )
         except Exception as e:
-            print(
-                f"{Fore.RED}An unexpected error occurred:\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
+            # One handler for every error type; the headline is looked up only
+            # once something has actually gone wrong.
+            headline = next(
+                (
+                    ERROR_HEADLINES[error_type]
+                    for error_type in type(e).__mro__
+                    if error_type in ERROR_HEADLINES
+                ),
+                "An unexpected error occurred:",
             )
+            print(_ERROR_TEMPLATE.format(headline=headline, error=e))
 
     return wrapper
 
 
+_command_instances: Dict[type, Command] = {}
+
+
 @input_error
 def handle_command(
     command: str, address_book: AddressBook, notes_book: NotesBook, *args: str
 ) -> None:
     """Handles the user command by calling the corresponding method."""
-    cmd = get_command(command)
-    if cmd:
-        cmd_instance = cmd(notes_book if "note" in command else address_book)
+    entry = command_registry.dispatch_table.get(command)
+    if entry:
+        cmd, is_notes = entry
+        if not cmd.accepts(len(args)):
+            Message.error("incorrect_arguments")
+            return
+        book = notes_book if is_notes else address_book
+        # Commands keep no state besides their book, so the last instance of
+        # each command is reused while it is bound to the same book; a new
+        # book replaces it, so at most one instance per command is kept.
+        cmd_instance = _command_instances.get(cmd)
+        if cmd_instance is None or cmd_instance.book_type is not book:
+            cmd_instance = _command_instances[cmd] = cmd(book)
         cmd_instance.execute(*args)
     else:
         Message.error("incorrect_command", command=command)
@@ -95,9 +122,9 @@ class ShowAllContactsCommand(Command):
 
     def execute(self, *args: str) -> None:
         """Shows all contacts in the address book."""
-        if self.book_type.data:
-            for record in self.book_type.data.values():
-                print(str(record))
+        if self.book_type:
+            records = self.book_type.values()
+            sys.stdout.write("".join(f"{record}\n" for record in records))
         else:
             raise IndexError("No contacts available.")
 
@@ -111,21 +138,17 @@ class AddContactCommand(Command):
     }
     example = {"en": "[name] [phone]", "ua": "[ім'я] [телефон]"}
     expected_fields = [Name]
+    arity = 2
 
     def execute(self, *args: str) -> None:
         """Adds a new contact to the address book."""
-        if len(args) != 2:
-            Message.error("incorrect_arguments")
-            return
         name, phone = args
         record = self.book_type.find_by_name(Name(name))
         if record:
-            if any(p.value == phone for p in record.fields.get("phones", [])):
+            if record.has_phone(phone):
                 Message.warning("contact_exists", name=name, phone=phone)
             else:
-                if not record.fields.get("phones"):
-                    record.fields["phones"] = []
-                record.fields["phones"].append(Phone(phone))
+                record.add_phone(Phone(phone))
                 Message.info("phone_added", name=name, phone=phone)
         else:
             new_record = Record(Name(name))
@@ -142,11 +165,9 @@ class DeleteCommand(Command):
     }
     example = {"en": "[name]", "ua": "[ім'я]"}
     expected_fields = [Name]
+    arity = 1
 
     def execute(self, *args: str) -> None:
-        if len(args) != 1:
-            Message.error("incorrect_arguments")
-            return
         name = args[0]
         record = self.book_type.find_by_name(Name(name))
         if not record:
@@ -170,15 +191,9 @@ class AddPhoneCommand(FieldCommand):
 
     def execute_field(self, record: Record, field: Field, **kwargs) -> None:
         """Adds a phone number to an existing contact."""
-        if "phones" not in record.fields:
-            record.fields["phones"] = []
-        elif isinstance(record.fields["phones"], list):
-            for existing_phone in record.fields["phones"]:
-                if existing_phone.value == field.value:
-                    Message.error(
-                        "contact_exists", name=record.name.value, phone=field.value
-                    )
-                    return
+        if record.has_phone(field.value):
+            Message.error("contact_exists", name=record.name.value, phone=field.value)
+            return
         record.add_phone(field)
         Message.info("phone_added", name=record.name.value, value=field.value)
 
@@ -194,12 +209,10 @@ class ChangeContactCommand(Command):
         "ua": "[ім'я] [попередній номер] [новий]",
     }
     expected_fields = [Name, Phone]
+    arity = 3
 
     def execute(self, *args: str) -> None:
         """Changes the phone number of an existing contact."""
-        if len(args) != 3:
-            Message.error("incorrect_arguments")
-            return
         name, old_phone, new_phone = args
         record = self.book_type.find_by_name(Name(name))
         if not record or "phones" not in record.fields:
@@ -207,8 +220,7 @@ class ChangeContactCommand(Command):
             return
 
         try:
-            phone_index = record.fields["phones"].index(Phone(old_phone))
-            record.fields["phones"][phone_index] = Phone(new_phone)
+            record.replace_phone(Phone(old_phone), Phone(new_phone))
             Message.info(
                 "phone_updated", name=name, old_phone=old_phone, new_phone=new_phone
             )
@@ -224,12 +236,10 @@ class ShowPhoneCommand(Command):
     }
     example = {"en": "[name]", "ua": "[ім'я]"}
     expected_fields = [Name]
+    arity = 1
 
     def execute(self, *args: str) -> None:
         """Shows the phone number of a contact."""
-        if len(args) != 1:
-            Message.error("incorrect_arguments")
-            return
         name = args[0]
         record = self.book_type.find_by_name(Name(name))
         if not record:
@@ -256,9 +266,10 @@ class AddEmailToContactCommand(FieldCommand):
 
     def execute_field(self, record: Record, field: Field) -> None:
         """Adds an email to an existing contact."""
-        if "emails" not in record.fields:
-            record.fields["emails"] = []
-        record.fields["emails"].append(field)
+        if record.has_email(field.value):
+            Message.warning("email_exists", name=record.name.value, value=field.value)
+            return
+        record.add_email(field)
         Message.info("email_added", name=record.name.value, value=field.value)
 
 
@@ -270,12 +281,10 @@ class ShowEmailCommand(Command):
     }
     example = {"en": "[name]", "ua": "[ім'я]"}
     expected_fields = [Name]
+    arity = 1
 
     def execute(self, *args: str) -> None:
         """Shows the email address(es) of a contact."""
-        if len(args) != 1:
-            Message.error("incorrect_arguments")
-            return
         name = args[0]
         record = self.book_type.find_by_name(Name(name))
         if not record:
@@ -299,12 +308,10 @@ class EditEmailOfContactCommand(ChangeContactCommand):
         "ua": "[ім'я] [старий email] [новий email]",
     }
     expected_fields = [Name, Email]
+    arity = 3
 
     def execute(self, *args: str) -> None:
         """Edits the email of a contact."""
-        if len(args) != 3:
-            Message.error("incorrect_arguments")
-            return
         name, old_email, new_email = args
         record = self.book_type.find_by_name(Name(name))
         if not record or "emails" not in record.fields:
@@ -312,8 +319,7 @@ class EditEmailOfContactCommand(ChangeContactCommand):
             return
 
         try:
-            email_index = record.fields["emails"].index(Email(old_email))
-            record.fields["emails"][email_index] = Email(new_email)
+            record.replace_email(Email(old_email), Email(new_email))
             Message.info(
                 "email_updated", name=name, old_email=old_email, new_email=new_email
             )
@@ -351,12 +357,10 @@ class EditAddressOfContactCommand(Command):
         "ua": "[ім'я] [попередня адреса] [нова адреса]",
     }
     expected_fields = [Name, Address]
+    arity = (2, None)
 
     def execute(self, *args: str) -> None:
         """Edits the address of a contact."""
-        if len(args) < 2:
-            Message.error("incorrect_arguments")
-            return
         name, *address = args
         record = self.book_type.find_by_name(Name(name))
 
@@ -413,11 +417,9 @@ class ShowUpcomingBirthdays(Command):
         "ua": "Виводить усі дні народження протягом заданої кількості днів.",
     }
     example = {"en": "[number of days]", "ua": "[кількість днів]"}
+    arity = 1
 
     def execute(self, *args: str) -> None:
-        if len(args) != 1:
-            Message.error("incorrect_arguments")
-            return
         set_number = int(args[0])
         upcoming_birthdays = self.book_type.get_upcoming_birthdays(set_number)
         if upcoming_birthdays:
@@ -438,27 +440,15 @@ class SearchContactsCommand(Command):
         "ua": "Шукає контакти за заданими критеріями.",
     }
     example = {"en": "[search string]", "ua": "[пошуковий запит]"}
+    arity = (1, None)
 
     def execute(self, *args: str) -> None:
         """Searches for contacts matching the given criteria."""
-        if len(args) < 1:
-            Message.error("incorrect_arguments")
-            return
-        keyword = " ".join(args).lower()
-        results = []
-        for record in self.book_type.values():
-            for field in record.fields.values():
-                if isinstance(field, list):
-                    if any(keyword in str(item).lower() for item in field):
-                        results.append(record)
-                        break
-                elif keyword in str(field).lower():
-                    results.append(record)
-                    break
+        keyword_lower = " ".join(args).lower()
+        results = self.book_type.search(keyword_lower)
 
         if results:
-            for record in results:
-                print(record)
+            sys.stdout.write("".join(f"{record}\n" for record in results))
         else:
             Message.info("no_results_found")
 
@@ -471,15 +461,16 @@ class AddNoteCommand(Command):
         "ua": "Додає нову нотатку.",
     }
     example = {"en": "[title] [text] [tags]", "ua": "[заголовок] [текст] [теги]"}
+    arity = (2, None)
 
     def execute(self, *args: tuple) -> None:
         """Adds a new note."""
-        if len(args) < 2:
-            Message.error("incorrect_arguments")
-            return
         title, *rest = args
-        text = " ".join(rest)
-        tags = [tag for tag in rest if tag.startswith("#")]
+        # One pass splits the words into tags and note text.
+        text_parts, tags = [], []
+        for word in rest:
+            (tags if word.startswith("#") else text_parts).append(word)
+        text = " ".join(text_parts)
         self.book_type.add_note(title, text, tags)
         Message.info("note_added", title=title)
 
@@ -491,12 +482,10 @@ class EditNoteCommand(Command):
         "ua": "Редагує наявну нотатку.",
     }
     example = {"en": "[id] [title] [text]", "ua": "[ID] [заголовок] [текст]"}
+    arity = (3, None)
 
     def execute(self, *args: tuple) -> None:
         """Edits an existing note."""
-        if len(args) < 3:
-            Message.error("incorrect_arguments")
-            return
         id_note, title, *text = args
         text = " ".join(text)
         self.book_type.edit_note(id_note, title, text)
@@ -510,12 +499,10 @@ class DeleteNoteCommand(Command):
         "ua": "Видаляє наявну нотатку.",
     }
     example = {"en": "[id]", "ua": "[ID]"}
+    arity = 1
 
     def execute(self, *args: tuple) -> None:
         """Deletes an existing note."""
-        if len(args) != 1:
-            Message.error("incorrect_arguments")
-            return
         note_id = args[0]
         self.book_type.delete_note(note_id)
         Message.info("note_deleted", title=note_id)
@@ -528,19 +515,13 @@ class FindNoteCommand(Command):
         "ua": "Знаходить нотатку за тегом.",
     }
     example = {"en": "[tag]", "ua": "[тег]"}
+    arity = 1
 
     def execute(self, *args: tuple) -> None:
         """Finds a note by its tag."""
-        if len(args) != 1:
-            Message.error("incorrect_arguments")
-            return
         tag = args[0]
         notes = self.book_type.find_notes_with_same_tags(tag)
-        for note in notes:
-            print(
-                f"\nID: {note['id']}\nTitle: {note['title']}\nText: {note['text']}\nTags: {', '.join(note['tags'])}\n"
-            )
-            print("-" * 40)
+        sys.stdout.write(format_notes(notes))
 
 
 @register_command("search-notes")
@@ -550,20 +531,14 @@ class SearchNotesCommand(Command):
         "ua": "Шукає нотатки за заданими критеріями.",
     }
     example = {"en": "[search string]", "ua": "[пошуковий запит]"}
+    arity = (1, None)
 
     def execute(self, *args: str) -> None:
         """Searches for notes matching the given criteria."""
-        if len(args) < 1:
-            Message.error("incorrect_arguments")
-            return
         keyword = " ".join(args)
         results = self.book_type.search_notes(keyword)
         if results:
-            for note in results:
-                print(
-                    f"\nID: {note['id']}\nTitle: {note['title']}\nText: {note['text']}\nTags: {', '.join(note['tags'])}\n"
-                )
-                print("-" * 40)
+            sys.stdout.write(format_notes(results))
         else:
             Message.info("no_results_found")
 
@@ -575,11 +550,7 @@ class DisplayNotesCommand(Command):
     def execute(self, *args: str) -> None:
         """Displays all notes."""
         notes = self.book_type.display_notes()
-        for note in notes:
-            print(
-                f"\nID: {note['id']}\nTitle: {note['title']}\nText: {note['text']}\nTags: {', '.join(note['tags'])}\n"
-            )
-            print("-" * 40)
+        sys.stdout.write(format_notes(notes))
 
 
 # Utility commands
@@ -592,9 +563,7 @@ class ExitCommand(Command):
     }
 
     def execute(self, *args: str) -> None:
-        """Saves the address book and exits the program."""
-        storage = FileStorage("addressbook.json")
-        storage.save_contacts(self.book_type.data)
+        """Exits the program; the persistence worker saves the book on the way out."""
         Message.info("exit_message")
         Command.exit_command_flag = True  # sys.exit()
 
@@ -609,49 +578,37 @@ class HelpCommand(Command):
 
     def execute(self, *args: str) -> None:
         """Displays this help message."""
+        language = settings.language
+        help_text = command_registry.help_cache.get(language)
+        if help_text is None:
+            help_text = self._format_help(language)
+            command_registry.help_cache[language] = help_text
+        print(help_text)
+
+    @staticmethod
+    def _format_help(language: str) -> str:
+        """Builds the help table for one language."""
         headers = {
             "en": ("Command", "Parameters", "Description"),
             "ua": ("Команда", "Параметри", "Опис"),
             "de": ("Befehl", "Parameter", "Beschreibung"),
         }
-        language = settings.language
-        max_command_len = max(
-            len(command_name)
-            for command_name in command_registry.command_registry.keys()
-        )
-        max_example_len = max(
-            (
-                len(command_class.example.get(language, ""))
-                if hasattr(command_class, "example")
-                else 0
-            )
-            for command_class in command_registry.command_registry.values()
-        )
+        rows = command_registry.help_rows(language)
+        max_command_len = max(len(command_name) for command_name, _, _ in rows)
+        max_example_len = max(len(example) for _, example, _ in rows)
 
         command_header, example_header, description_header = headers[language]
-        print(
+        lines = [
             f"\n{Style.BRIGHT}{Fore.CYAN}{command_header.ljust(max_command_len)}\t{example_header.ljust(max_example_len)}\t{description_header}{Style.RESET_ALL}"
+        ]
+        lines.extend(
+            f"{Style.BRIGHT}{Fore.WHITE}{command_name.ljust(max_command_len)}{Style.RESET_ALL}"
+            f"\t{Fore.WHITE}{example.ljust(max_example_len)}{Style.RESET_ALL}"
+            f"\t{Fore.GREEN}{description}{Style.RESET_ALL}"
+            for command_name, example, description in rows
         )
 
-        for command_name, command_class in command_registry.command_registry.items():
-            description = command_class.description.get(
-                language
-            ) or command_class.description.get("en", "No description available.")
-            example = (
-                command_class.example.get(language, "")
-                if hasattr(command_class, "example")
-                else ""
-            )
-
-            command_str = f"{Style.BRIGHT}{Fore.WHITE}{command_name.ljust(max_command_len)}{Style.RESET_ALL}"
-            example_str = (
-                f"{Fore.WHITE}{example.ljust(max_example_len)}{Style.RESET_ALL}"
-            )
-            description_str = f"{Fore.GREEN}{description}{Style.RESET_ALL}"
-
-            print(f"{command_str}\t{example_str}\t{description_str}")
-
-        print()
+        return "\n".join(lines) + "\n"
 
 
 @register_command("set-language")
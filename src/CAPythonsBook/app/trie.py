@@ -0,0 +1,35 @@
+from collections import deque
+from typing import Any, Dict, Iterator
+
+
+class Trie:
+    """Prefix tree over lowercased words, used for autocompletion."""
+
+    # Children are keyed by single characters, so the empty string can hold
+    # the payloads of the word ending at a node without clashing.
+    _PAYLOADS = ""
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, word: str, payload: Any) -> None:
+        node = self._root
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node.setdefault(self._PAYLOADS, []).append(payload)
+
+    def iter_prefix(self, prefix: str) -> Iterator[Any]:
+        """Yields the payloads of every word starting with prefix, shortest first."""
+        node = self._root
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return
+        queue = deque([node])
+        while queue:
+            node = queue.popleft()
+            for key, child in node.items():
+                if key == self._PAYLOADS:
+                    yield from child
+                else:
+                    queue.append(child)
@@ -1,11 +1,26 @@
 import sys
-from typing import Callable, Dict, List, Optional
-from collections import UserDict
-from colorama import Fore, Style, init
-from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from collections import defaultdict
+from colorama import init
+from datetime import date, datetime
+from functools import lru_cache, partial
+from itertools import islice
 import pickle
 import re
 
+# Colour codes are empty strings when output is not a terminal. Kept here
+# rather than imported from the package so the script still runs on its own.
+if sys.stdout is not None and sys.stdout.isatty():
+    from colorama import Fore, Style
+else:
+
+    class _NoColor:
+        def __getattr__(self, name: str) -> str:
+            return ""
+
+    Fore = Style = _NoColor()
+
+
 class Field:
     """Base class for all fields in a record.
 
@@ -15,9 +30,14 @@ class Field:
         The value of the field.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str):
         self.value = value
 
+    def __setstate__(self, state):
+        _restore_state(self, state)
+
     def __str__(self):
         """Return the string representation of the field.
 
@@ -43,6 +63,8 @@ class Name(Field):
         If the name is empty.
     """
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         if not value:
             raise ValueError("Name cannot be empty.")
@@ -50,7 +72,6 @@ class Name(Field):
 
 
 class Phone(Field):
-    phone_pattern = re.compile(r"^\+?[1-9]\d{9,14}$")
     """Class for storing phone numbers. Inherits from Field.
 
     Parameters
@@ -63,6 +84,11 @@ class Phone(Field):
     ValueError
         Phone number must be 10-15 digits and may start with +.
     """
+
+    __slots__ = ()
+
+    phone_pattern = re.compile(r"^\+?[1-9]\d{9,14}$")
+
     def __init__(self, value: str):
         if not Phone.phone_pattern.match(value):
             raise ValueError("Phone number must be 10-15 digits and may start with +")
@@ -81,6 +107,9 @@ class Email(Field):
     ValueError
         If the email format is incorrect.
     """
+
+    __slots__ = ()
+
     EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
 
     def __init__(self, value: str):
@@ -103,6 +132,8 @@ class Address(Field):
                     If the address is empty.
                 """
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         if not value:
             raise ValueError("Address cannot be empty.")
@@ -123,14 +154,22 @@ class Birthday(Field):
         If the date format is incorrect.
     """
 
+    __slots__ = ("date",)
+
     def __init__(self, value: str):
         try:
-            datetime.strptime(value, "%d.%m.%Y")
+            self.date = _parse_date(value)
         except ValueError:
             raise ValueError("Invalid date format. Use DD.MM.YYYY")
         super().__init__(value)
 
 
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> date:
+    """Parse a DD.MM.YYYY string; strptime is slow, so results are cached."""
+    return datetime.strptime(value, "%d.%m.%Y").date()
+
+
 class Record:
     """Class for storing contact information, including name, phone numbers, and birthday.
 
@@ -140,23 +179,66 @@ class Record:
         The name of the contact.
     """
 
+    __slots__ = (
+        "name",
+        "phones",
+        "birthday",
+        "email",
+        "address",
+        "_phone_index",
+        "_owner",
+    )
+
     def __init__(self, name: Name):
         self.name = name
         self.phones = []
         self.birthday = None
         self.email = None
         self.address = None
+        self._phone_index: Dict[str, Phone] = {}
+        self._owner: Optional["AddressBook"] = None
+
+    def _phones_by_value(self) -> Dict[str, Phone]:
+        """Return the phone number -> first Phone with it index.
+
+        Records pickled before the index existed get it built on first use.
+        """
+        index = getattr(self, "_phone_index", None)
+        if index is None:
+            index = {}
+            for phone in self.phones:
+                index.setdefault(phone.value, phone)
+            self._phone_index = index
+        return index
+
+    def has_phone(self, phone_number: str) -> bool:
+        """Check whether the contact has the given phone number."""
+        return phone_number in self._phones_by_value()
+
+    def _pop_phone(self, phone_number: str) -> Optional[Phone]:
+        index = self._phones_by_value()
+        phone = index.pop(phone_number, None)
+        if phone is not None:
+            had_duplicates = len(index) + 1 != len(self.phones)
+            # The index holds the first occurrence, so any other copy of the
+            # number comes after it: one pass finds and deletes it by position.
+            position = self.phones.index(phone)
+            del self.phones[position]
+            if had_duplicates:
+                for other in islice(self.phones, position, None):
+                    if other.value == phone_number:
+                        index[phone_number] = other
+                        break
+        return phone
 
     def add_phone(self, phone: Phone):
         """Add a phone number to the contact."""
+        self._phones_by_value().setdefault(phone.value, phone)
         self.phones.append(phone)
 
     def remove_phone(self, phone: Phone):
         """Remove a phone number from the contact."""
-        for p in self.phones:
-            if p.value == phone.value:
-                self.phones.remove(p)
-                break
+        self._pop_phone(phone.value)
 
     def edit_phone(self, old_phone: Phone, new_phone: Phone):
         """Edit an existing phone number in the contact."""
@@ -165,14 +247,7 @@ class Record:
 
     def delete_phone(self, phone_number: str):
         """Delete a phone number from the contact."""
-        phone_to_delete = None
-        for phone in self.phones:
-            if phone.value == phone_number:
-                phone_to_delete = phone
-                break
-        if phone_to_delete:
-            self.phones.remove(phone_to_delete)
-        else:
+        if self._pop_phone(phone_number) is None:
             raise ValueError(f"Phone number {phone_number} not found.")
 
     def add_email(self, email: Email):
@@ -198,6 +273,11 @@ class Record:
     def add_birthday(self, birthday: Birthday):
         """Add a birthday to the contact."""
         self.birthday = birthday
+        if self._owner is not None:
+            self._owner.version += 1
+
+    def __setstate__(self, state):
+        _restore_state(self, state)
 
     def __str__(self):
         """Return the string representation of the contact."""
@@ -210,61 +290,136 @@ class Record:
         return f"{Fore.GREEN}Contact name: {Fore.CYAN}{self.name}{Fore.GREEN}, phones: {Fore.CYAN}{phones}{birthday}{Style.RESET_ALL}"
 
 
-class AddressBook(UserDict):
+# Days to add to a date, by weekday, to move weekends to the next Monday.
+_WEEKEND_SHIFT = (0,) * 5 + (2, 1)
+
+
+class AddressBook(dict):
     """Class for storing and managing contact records."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # Bumped on every change that can affect the birthday index.
+        self.version = 0
+        self._birthday_index = None
+        for name, record in dict(*args, **kwargs).items():
+            self[name] = record
+
+    def __reduce__(self):
+        # Rebuilt through __init__ and __setitem__ so records get their owner
+        # back; the birthday index is a cache and is left out.
+        state = {**self.__dict__, "_birthday_index": None}
+        return type(self), (), state, None, iter(self.items())
+
+    def __setitem__(self, name: str, record: Record):
+        super().__setitem__(name, record)
+        record._owner = self
+        self.version += 1
+
+    def __delitem__(self, name: str):
+        super().__delitem__(name)
+        self.version += 1
+
     def add_record(self, record: Record):
         """Add a record to the address book."""
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
-    def delete_contact(self, name: Name):
+    def delete_contact(self, name: Union[Name, str]):
         """Delete a record from the address book by name."""
-        if name.value in self.data:
-            del self.data[name.value]
+        key = name.value if isinstance(name, Name) else name
+        if key in self:
+            del self[key]
         else:
             raise KeyError(f"Record with name '{name}' not found")
 
-    def find(self, name: Name) -> Optional[Record]:
-        """Find a record in the address book by name."""
-        return self.data.get(name.value, None)
+    def find(self, name: Union[Name, str]) -> Optional[Record]:
+        """Find a record in the address book by name.
 
-    def get_upcoming_birthdays(self, set_number: int) -> List[Dict[str, str]]:
-        """Get upcoming birthdays within a set amount of days for contacts."""
-        today = datetime.today().date()
-        upcoming_birthdays = []
-
-        for record in self.data.values():
-            if record.birthday:
-                birthday = datetime.strptime(record.birthday.value, "%d.%m.%Y").date()
-                birthday_this_year = birthday.replace(year=today.year)
-
-                if birthday_this_year < today:
-                    birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-
-                day_difference = (birthday_this_year - today).days
-                if 0 <= day_difference <= set_number:
-                    congratulation_date = birthday_this_year
-                    if (
-                        birthday_this_year.weekday() > 4
-                    ):  # If Saturday (5) or Sunday (6)
-                        congratulation_date += timedelta(
-                            days=7 - birthday_this_year.weekday()
-                        )
-
-                    upcoming_birthdays.append(
-                        {
-                            "name": record.name.value,
-                            "congratulation_date": congratulation_date.strftime(
-                                "%d.%m.%Y"
-                            ),
-                        }
+        Handlers pass the raw name string, which skips building a Name.
+        """
+        key = name.value if isinstance(name, Name) else name
+        return self.get(key, None)
+
+    def _birthdays_by_day(self) -> Dict[Tuple[int, int], List[Tuple[int, str]]]:
+        """Return (month, day) -> [(position in the book, name)].
+
+        Rebuilt only after the book or one of its birthdays has changed.
+        """
+        if self._birthday_index is None or self._birthday_index[0] != self.version:
+            index = defaultdict(list)
+            for position, record in enumerate(self.values()):
+                if record.birthday:
+                    born = record.birthday.date
+                    index[(born.month, born.day)].append(
+                        (position, record.name.value)
                     )
+            self._birthday_index = (self.version, index)
+        return self._birthday_index[1]
 
-        return upcoming_birthdays
+    def get_upcoming_birthdays(self, set_number: int) -> List[Dict[str, str]]:
+        """Get upcoming birthdays within a set amount of days for contacts."""
+        today = date.today()
+        index = self._birthdays_by_day()
+        # Probe the index once per day of the window instead of visiting every
+        # record. A year covers every birthday, so the first hit is the next
+        # occurrence; positions restore the book's order.
+        window = {}
+        start = today.toordinal()
+        for ordinal in range(start, start + min(set_number, 365) + 1):
+            day = date.fromordinal(ordinal)
+            congratulation_date = date.fromordinal(
+                ordinal + _WEEKEND_SHIFT[day.weekday()]
+            )
+            window.setdefault((day.month, day.day), congratulation_date)
+        matches = []
+        for month_day, congratulation_date in window.items():
+            for position, name in index.get(month_day, ()):
+                matches.append((position, name, congratulation_date))
+        matches.sort()
+
+        return [
+            {
+                "name": name,
+                "congratulation_date": congratulation_date.strftime("%d.%m.%Y"),
+            }
+            for _, name, congratulation_date in matches
+        ]
 
     def __str__(self):
         """Return the string representation of the address book."""
-        return "\n".join(str(record) for record in self.data.values())
+        return "\n".join(str(record) for record in self.values())
+
+
+# Message templates, coloured once at import instead of on every print.
+_RST = Style.RESET_ALL
+_ERR_COMMAND = f"{Fore.RED}Error: Incorrect command.\n{Fore.MAGENTA}{{error}}{_RST}"
+_ERR_ARGUMENTS = f"{Fore.RED}Error: Incorrect arguments.\n{Fore.MAGENTA}{{error}}{_RST}"
+_ERR_NOT_FOUND = f"{Fore.RED}Error: Contact not found.\n{Fore.MAGENTA}{{error}}{_RST}"
+_ERR_INDEX = f"{Fore.RED}Error: Index out of range.\n{Fore.MAGENTA}{{error}}{_RST}"
+_ERR_UNEXPECTED = f"{Fore.RED}An unexpected error occurred:\n{Fore.MAGENTA}{{error}}{_RST}"
+_CONTACT_EXISTS = f'{Fore.YELLOW}Contact "{Fore.CYAN}{{name}}{Fore.YELLOW}" with phone number "{Fore.CYAN}{{phone}}{Fore.YELLOW}" already exists.{_RST}'
+_CONTACT_HAS_NUMBER = f'{Fore.YELLOW}Contact "{Fore.CYAN}{{name}}{Fore.YELLOW}" is already added with the number "{Fore.CYAN}{{current_phone}}{Fore.YELLOW}".\nTo change the number, use the "{_RST}change{Fore.YELLOW}" command.{_RST}'
+_CONTACT_ADDED = f'{Fore.GREEN}Contact "{Fore.CYAN}{{name}}{Fore.GREEN}" added with phone number "{Fore.CYAN}{{phone}}{Fore.GREEN}".{_RST}'
+_PHONE_UNCHANGED = f'{Fore.YELLOW}Contact "{Fore.CYAN}{{name}}{Fore.YELLOW}" already has this phone number: "{Fore.CYAN}{{new_phone}}{Fore.YELLOW}". No changes were made.{_RST}'
+_PHONE_CHANGED = f'{Fore.GREEN}For user {Fore.CYAN}"{{name}}"{Fore.GREEN}, the phone has been changed from "{Fore.CYAN}{{current_phone}}{Fore.GREEN}" to "{Fore.CYAN}{{new_phone}}{Fore.GREEN}".{_RST}'
+_CONTACT_DELETED = f"{Fore.GREEN}Contact {Fore.CYAN}{{name}}{Fore.GREEN} deleted{_RST}"
+_PHONE_INFO = f'{Fore.GREEN}Phone number of "{Fore.CYAN}{{name}}{Fore.GREEN}": {Fore.CYAN}{{phones}}{_RST}'
+_PHONE_ADDED = f"{Fore.GREEN}For user {Fore.CYAN}{{name}}{Fore.GREEN} added an additional phone number: {Fore.CYAN}{{phone}}{_RST}"
+_PHONE_DELETED = f"{Fore.GREEN}Phone {Fore.CYAN}{{phone}}{Fore.GREEN} for {Fore.CYAN}{{name}}{Fore.GREEN} deleted{_RST}"
+_PHONE_ERROR = f"{Fore.RED}{{error}}{_RST}"
+_EMAIL_SET = f"{Fore.GREEN}Email for {Fore.CYAN}{{name}}{Fore.GREEN} set to {Fore.CYAN}{{email}}{_RST}"
+_EMAIL_CHANGED = f"{Fore.GREEN}Email for {Fore.CYAN}{{name}}{Fore.GREEN} changed to {Fore.CYAN}{{email}}{_RST}"
+_ADDRESS_SET = f"{Fore.GREEN}Address for {Fore.CYAN}{{name}}{Fore.GREEN} set to {Fore.CYAN}{{address_str}}{_RST}"
+_ADDRESS_CHANGED = f"{Fore.GREEN}Address for {Fore.CYAN}{{name}}{Fore.GREEN} changed to {Fore.CYAN}{{address_str}}{_RST}"
+_EMAIL_DELETED = f"{Fore.GREEN}Email for {Fore.CYAN}{{name}}{Fore.GREEN} deleted{_RST}"
+_EMAIL_INFO = f"{Fore.GREEN}Email of {Fore.CYAN}{{name}}{Fore.GREEN}: {Fore.CYAN}{{email}}{_RST}"
+_NO_EMAIL = f"{Fore.YELLOW}No email set for {Fore.CYAN}{{name}}{Fore.YELLOW}.{_RST}"
+_BIRTHDAY_SET = f"{Fore.GREEN}Birthday for {Fore.CYAN}{{name}}{Fore.GREEN} set to {Fore.CYAN}{{birthday_str}}{_RST}"
+_BIRTHDAY_INFO = f"{Fore.GREEN}Birthday of {Fore.CYAN}{{name}}{Fore.GREEN}: {Fore.CYAN}{{birthday}}{_RST}"
+_NO_BIRTHDAY = f"{Fore.YELLOW}No birthday set for {Fore.CYAN}{{name}}{Fore.YELLOW}.{_RST}"
+_UPCOMING_BIRTHDAY = f"{Fore.GREEN}{{name}}: {Fore.CYAN}{{date}}{_RST}"
+_NO_UPCOMING_BIRTHDAYS = f"{Fore.YELLOW}No upcoming birthdays in {{set_number}} days.{_RST}"
+_GOOD_BYE = f"{Fore.GREEN}{Style.BRIGHT}Good bye!{_RST}"
 
 
 def input_error(handler: Callable) -> Callable:
@@ -275,24 +430,24 @@ def input_error(handler: Callable) -> Callable:
             return handler(*args, **kwargs)
         except TypeError as e:
             print(
-                f"{Fore.RED}Error: Incorrect command.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
+                _ERR_COMMAND.format(error=e)
             )
             help_command()
         except ValueError as e:
             print(
-                f"{Fore.RED}Error: Incorrect arguments.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
+                _ERR_ARGUMENTS.format(error=e)
             )
         except KeyError as e:
             print(
-                f"{Fore.RED}Error: Contact not found.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
+                _ERR_NOT_FOUND.format(error=e)
             )
         except IndexError as e:
             print(
-                f"{Fore.RED}Error: Index out of range.\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
+                _ERR_INDEX.format(error=e)
             )
         except Exception as e:
             print(
-                f"{Fore.RED}An unexpected error occurred:\n{Fore.MAGENTA}{e}{Style.RESET_ALL}"
+                _ERR_UNEXPECTED.format(error=e)
             )
 
     return wrapper
@@ -311,15 +466,20 @@ def parse_input(user_input: str) -> tuple[str, List[str]]:
     tuple[str, List[str]]
         The command and a list of arguments.
     """
-    parts = user_input.lower().split()
+    # Arguments are lowercased as well: contacts are stored and looked up by
+    # lowercased name, so the whole line is lowercased in one go.
+    # Any run of whitespace ends the command; only the rest is split further.
+    parts = user_input.lower().split(None, 1)
     command = parts[0] if parts else ""
-    args = parts[1:] if len(parts) > 1 else []
-    return command, args
+    args = parts[1].split() if len(parts) > 1 else []
+    # Interned like the handler table's literal keys, so the dispatch lookup
+    # matches by identity instead of comparing the strings.
+    return sys.intern(command), args
 
 
 @input_error
 def handle_command(
-    command_handlers: Dict[str, Callable[[Optional[List[str]]], None]],
+    command_handlers: Dict[str, Callable[..., None]],
     command: str,
     args: Optional[List[str]],
 ) -> None:
@@ -327,24 +487,23 @@ def handle_command(
 
     Parameters
     ----------
-    command_handlers : Dict[str, Callable[[Optional[List[str]]], None]]
-        A dictionary mapping commands to their handlers.
+    command_handlers : Dict[str, Callable[..., None]]
+        A dictionary mapping commands to their handlers, which are called
+        with the arguments unpacked.
     command : str
         The command to handle.
     args : Optional[List[str]]
         The arguments for the command.
     """
-    if command in command_handlers:
-        if args is None:
-            args = []  # Use an empty list if no arguments are provided
-        command_handlers[command](args)
-    else:
+    handler = command_handlers.get(command)
+    if handler is None:
         raise TypeError(f"Unknown command '{command}'")
+    handler(*(args or ()))  # No arguments if none are provided
 
 
 @input_error
-def hello() -> None:
-    """Greet the user."""
+def hello(*_: str) -> None:
+    """Greet the user; any arguments are ignored."""
     print(f"{Fore.CYAN}How can I help you?{Style.RESET_ALL}")
 
 
@@ -362,23 +521,23 @@ def add_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: add [name] [phone number]")
     name, phone = args
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
-        if any(p.value == phone for p in record.phones):
+        if record.has_phone(phone):
             print(
-                f'{Fore.YELLOW}Contact "{Fore.CYAN}{name}{Fore.YELLOW}" with phone number "{Fore.CYAN}{phone}{Fore.YELLOW}" already exists.{Style.RESET_ALL}'
+                _CONTACT_EXISTS.format(name=name, phone=phone)
             )
         else:
             current_phone = record.phones[0].value if record.phones else "No phone"
             print(
-                f'{Fore.YELLOW}Contact "{Fore.CYAN}{name}{Fore.YELLOW}" is already added with the number "{Fore.CYAN}{current_phone}{Fore.YELLOW}".\nTo change the number, use the "{Style.RESET_ALL}change{Fore.YELLOW}" command.{Style.RESET_ALL}'
+                _CONTACT_HAS_NUMBER.format(name=name, current_phone=current_phone)
             )
     else:
         new_record = Record(Name(name))
         new_record.add_phone(Phone(phone))
         contacts.add_record(new_record)
         print(
-            f'{Fore.GREEN}Contact "{Fore.CYAN}{name}{Fore.GREEN}" added with phone number "{Fore.CYAN}{phone}{Fore.GREEN}".{Style.RESET_ALL}'
+            _CONTACT_ADDED.format(name=name, phone=phone)
         )
 
 
@@ -396,20 +555,19 @@ def change_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: change [name] [new phone number]")
     name, new_phone = args
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
-        phone_pattern = re.compile(r"^\+?[1-9]\d{9,14}$")
-        if not phone_pattern.match(new_phone):
-            raise ValueError("Phone number must be 10-15 digits and may start with +")
+        # Validates the number with Phone's precompiled pattern.
+        phone = Phone(new_phone)
         current_phone = record.phones[0].value if record.phones else None
         if new_phone == current_phone:
             print(
-                f'{Fore.YELLOW}Contact "{Fore.CYAN}{name}{Fore.YELLOW}" already has this phone number: "{Fore.CYAN}{new_phone}{Fore.YELLOW}". No changes were made.{Style.RESET_ALL}'
+                _PHONE_UNCHANGED.format(name=name, new_phone=new_phone)
             )
         else:
-            record.edit_phone(record.phones[0], Phone(new_phone))
+            record.edit_phone(record.phones[0], phone)
             print(
-                f'{Fore.GREEN}For user {Fore.CYAN}"{name}"{Fore.GREEN}, the phone has been changed from "{Fore.CYAN}{current_phone}{Fore.GREEN}" to "{Fore.CYAN}{new_phone}{Fore.GREEN}".{Style.RESET_ALL}'
+                _PHONE_CHANGED.format(name=name, current_phone=current_phone, new_phone=new_phone)
             )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -428,9 +586,8 @@ def delete_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 1:
         raise ValueError("Usage: delete-contact [name]")
     name = args[0]
-    contact_name = Name(name)
-    contacts.delete_contact(contact_name)
-    print(f"{Fore.GREEN}Contact {Fore.CYAN}{name}{Fore.GREEN} deleted{Style.RESET_ALL}")
+    contacts.delete_contact(name)
+    print(_CONTACT_DELETED.format(name=name))
 
 @input_error
 def show_phone(contacts: AddressBook, *args: str) -> None:
@@ -446,11 +603,11 @@ def show_phone(contacts: AddressBook, *args: str) -> None:
     if len(args) != 1:
         raise ValueError("Usage: phone [name]")
     name = args[0]
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         phones = "; ".join([phone.value for phone in record.phones])
         print(
-            f'{Fore.GREEN}Phone number of "{Fore.CYAN}{name}{Fore.GREEN}": {Fore.CYAN}{phones}{Style.RESET_ALL}'
+            _PHONE_INFO.format(name=name, phones=phones)
         )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -462,11 +619,11 @@ def add_phone_to_contact(address_book: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: add-phone [name] [phone number]")
     name, phone = args
-    record = address_book.find(Name(name))
+    record = address_book.find(name)
     if record:
         record.add_phone(Phone(phone))
         print(
-            f"{Fore.GREEN}For user {Fore.CYAN}{name}{Fore.GREEN} added an additional phone number: {Fore.CYAN}{phone}{Style.RESET_ALL}"
+            _PHONE_ADDED.format(name=name, phone=phone)
         )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -477,13 +634,13 @@ def delete_phone_from_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: delete-phone [name] [phone]")
     name, phone = args
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         try:
             record.delete_phone(phone)
-            print(f"{Fore.GREEN}Phone {Fore.CYAN}{phone}{Fore.GREEN} for {Fore.CYAN}{name}{Fore.GREEN} deleted{Style.RESET_ALL}")
+            print(_PHONE_DELETED.format(phone=phone, name=name))
         except ValueError as e:
-            print(f"{Fore.RED}{str(e)}{Style.RESET_ALL}")
+            print(_PHONE_ERROR.format(error=e))
     else:
         raise KeyError(f"Name '{name}' not found.")
 
@@ -493,11 +650,11 @@ def add_email_to_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: add-email [name] [email]")
     name, email = args
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         record.add_email(Email(email))
         print(
-            f"{Fore.GREEN}Email for {Fore.CYAN}{name}{Fore.GREEN} set to {Fore.CYAN}{email}{Style.RESET_ALL}"
+            _EMAIL_SET.format(name=name, email=email)
         )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -508,11 +665,11 @@ def edit_email_of_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: edit-email [name] [new email]")
     name, email = args
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         record.edit_email(Email(email))
         print(
-            f"{Fore.GREEN}Email for {Fore.CYAN}{name}{Fore.GREEN} changed to {Fore.CYAN}{email}{Style.RESET_ALL}"
+            _EMAIL_CHANGED.format(name=name, email=email)
         )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -524,11 +681,11 @@ def add_address_to_contact(contacts: AddressBook, *args: str) -> None:
         raise ValueError("Usage: add-address [name] [address separated with spaces]")
     name = args[0]
     address_str = ", ".join([str(address_part) for address_part in args[1:]])
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         record.add_address(Address(address_str))
         print(
-            f"{Fore.GREEN}Address for {Fore.CYAN}{name}{Fore.GREEN} set to {Fore.CYAN}{address_str}{Style.RESET_ALL}"
+            _ADDRESS_SET.format(name=name, address_str=address_str)
         )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -540,11 +697,11 @@ def edit_address_of_contact(contacts: AddressBook, *args: str) -> None:
         raise ValueError("Usage: edit-address [name] [address separated with spaces]")
     name = args[0]
     address_str = ", ".join([str(address_part) for address_part in args[1:]])
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         record.edit_address(Address(address_str))
         print(
-            f"{Fore.GREEN}Address for {Fore.CYAN}{name}{Fore.GREEN} changed to {Fore.CYAN}{address_str}{Style.RESET_ALL}"
+            _ADDRESS_CHANGED.format(name=name, address_str=address_str)
         )
 
 @input_error
@@ -553,10 +710,10 @@ def delete_email_from_contact(contacts: AddressBook, *args: str) -> None:
     if len(args) != 1:
         raise ValueError("Usage: delete-email [name]")
     name = args[0]
-    record = contacts.find(Name(name))
+    record = contacts.find(name)
     if record:
         record.delete_email()
-        print(f"{Fore.GREEN}Email for {Fore.CYAN}{name}{Fore.GREEN} deleted{Style.RESET_ALL}")
+        print(_EMAIL_DELETED.format(name=name))
     else:
         raise KeyError(f"Name '{name}' not found.")
     
@@ -566,21 +723,21 @@ def show_email(address_book: AddressBook, *args: str) -> None:
     if len(args) != 1:
         raise ValueError("Usage: email [name]")
     name = args[0]
-    record = address_book.find(Name(name))
+    record = address_book.find(name)
     if record:
         if record.email:
             print(
-                f"{Fore.GREEN}Email of {Fore.CYAN}{record.name.value}{Fore.GREEN}: {Fore.CYAN}{record.email.value}{Style.RESET_ALL}"
+                _EMAIL_INFO.format(name=record.name.value, email=record.email.value)
             )
         else:
             print(
-                f"{Fore.YELLOW}No email set for {Fore.CYAN}{name}{Fore.YELLOW}.{Style.RESET_ALL}"
+                _NO_EMAIL.format(name=name)
             )
     else:
         raise KeyError(f"Name '{name}' not found.")
 
 @input_error
-def show_all_contacts(contacts: AddressBook) -> None:
+def show_all_contacts(contacts: AddressBook, *_: str) -> None:
     """Show all contacts.
 
     Parameters
@@ -588,9 +745,8 @@ def show_all_contacts(contacts: AddressBook) -> None:
     contacts : AddressBook
         The address book containing contacts.
     """
-    if contacts.data:
-        for record in contacts.data.values():
-            print(str(record))
+    if contacts:
+        sys.stdout.write(str(contacts) + "\n")
     else:
         raise IndexError("No contacts available.")
 
@@ -601,11 +757,11 @@ def add_birthday(address_book: AddressBook, *args: str) -> None:
     if len(args) != 2:
         raise ValueError("Usage: add-birthday [name] [birthday in DD.MM.YYYY]")
     name, birthday_str = args
-    record = address_book.find(Name(name))
+    record = address_book.find(name)
     if record:
         record.add_birthday(Birthday(birthday_str))
         print(
-            f"{Fore.GREEN}Birthday for {Fore.CYAN}{name}{Fore.GREEN} set to {Fore.CYAN}{birthday_str}{Style.RESET_ALL}"
+            _BIRTHDAY_SET.format(name=name, birthday_str=birthday_str)
         )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -617,15 +773,15 @@ def show_birthday(address_book: AddressBook, *args: str) -> None:
     if len(args) != 1:
         raise ValueError("Usage: show-birthday [name]")
     name = args[0]
-    record = address_book.find(Name(name))
+    record = address_book.find(name)
     if record:
         if record.birthday:
             print(
-                f"{Fore.GREEN}Birthday of {Fore.CYAN}{record.name.value}{Fore.GREEN}: {Fore.CYAN}{record.birthday.value}{Style.RESET_ALL}"
+                _BIRTHDAY_INFO.format(name=record.name.value, birthday=record.birthday.value)
             )
         else:
             print(
-                f"{Fore.YELLOW}No birthday set for {Fore.CYAN}{name}{Fore.YELLOW}.{Style.RESET_ALL}"
+                _NO_BIRTHDAY.format(name=name)
             )
     else:
         raise KeyError(f"Name '{name}' not found.")
@@ -641,147 +797,165 @@ def birthdays(address_book: AddressBook, *args: str) -> None:
     if upcoming_birthdays:
         for entry in upcoming_birthdays:
             print(
-                f"{Fore.GREEN}{entry['name']}: {Fore.CYAN}{entry['congratulation_date']}{Style.RESET_ALL}"
+                _UPCOMING_BIRTHDAY.format(name=entry["name"], date=entry["congratulation_date"])
             )
     else:
         print(
-            f"{Fore.YELLOW}No upcoming birthdays in {set_number} days.{Style.RESET_ALL}"
+            _NO_UPCOMING_BIRTHDAYS.format(set_number=set_number)
         )
 
 
-def handle_exit(address_book: AddressBook) -> None:
+def handle_exit(address_book: AddressBook, *_: str) -> None:
     """Exit the program, saving the address book to a file."""
     save_data(address_book)  # Save the address book before exiting
-    print(f"{Fore.GREEN}{Style.BRIGHT}Good bye!{Style.RESET_ALL}")
+    print(_GOOD_BYE)
     sys.exit()
 
 
 def save_data(book: AddressBook, filename="addressbook.pkl"):
     with open(filename, "wb") as f:
-        pickle.dump(book, f)
+        pickle.dump(book, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def load_data(filename="addressbook.pkl") -> AddressBook:
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            book = pickle.load(f)
     except FileNotFoundError:
         return AddressBook()  # Return a new address book if the file is not found
+    _upgrade(book)
+    return book
 
 
-def help_command():
+def _restore_state(obj, state) -> None:
+    """Restore a pickled Field or Record.
+
+    Pickles from before __slots__ hold a plain __dict__; newer ones hold a
+    (None, slots) pair.
+    """
+    if isinstance(state, tuple):
+        state = {**(state[0] or {}), **state[1]}
+    for key, value in state.items():
+        setattr(obj, key, value)
+
+
+def _upgrade(book: AddressBook) -> None:
+    """Fill in attributes missing from address books saved by older versions."""
+    # Books saved while AddressBook was a UserDict keep their records in a
+    # "data" attribute instead of in the dict itself.
+    records = book.__dict__.pop("data", None)
+    if records is not None:
+        dict.update(book, records)
+    book.version = 0
+    book._birthday_index = None
+    for record in book.values():
+        record._owner = book
+        if record.birthday and getattr(record.birthday, "date", None) is None:
+            record.birthday.date = _parse_date(record.birthday.value)
+
+
+# Built once at import; help is shown at start-up and after unknown commands.
+_HELP_TEXT = "\n".join(
+    [
+        f"{Fore.GREEN}This bot helps you manage your contacts.{Style.RESET_ALL}",
+        f"{Fore.GREEN}You can use the following commands:{Style.RESET_ALL}",
+        f"hello{Fore.GREEN} - Greets the user.{Style.RESET_ALL}",
+        f"add [name] [phone number]{Fore.GREEN} - Adds a new contact.{Style.RESET_ALL}",
+        f"change [name] [new phone number]{Fore.GREEN} - Changes the phone number of an existing contact.{Style.RESET_ALL}",
+        f"phone [name]{Fore.GREEN} - Shows the phone number of a contact.{Style.RESET_ALL}",
+        f"add-phone [name] [phone number]{Fore.GREEN} - Adds an additional phone to a contact.{Style.RESET_ALL}",
+        f"add-email [name] [email]{Fore.GREEN} - Adds an email to a contact.{Style.RESET_ALL}",
+        f"edit-email [name] [new email]{Fore.GREEN} - Edits the email of a contact.{Style.RESET_ALL}",
+        f"email [name]{Fore.GREEN} - Show the email of a contact.{Style.RESET_ALL}",
+        f"add-address [name] [address]{Fore.GREEN} - Adds an address to a contact.{Style.RESET_ALL}",
+        f"edit-address [name] [address]{Fore.GREEN} - Edits the address of a contact{Style.RESET_ALL}",
+        f"all{Fore.GREEN} - Shows all contacts.{Style.RESET_ALL}",
+        f"add-birthday [name] [birthday]{Fore.GREEN} - Adds a birthday to a contact.{Style.RESET_ALL}",
+        f"show-birthday [name]{Fore.GREEN} - Shows the birthday of a contact.{Style.RESET_ALL}",
+        f"birthdays [number of days]{Fore.GREEN} - Shows upcoming birthdays in a set amount of days.{Style.RESET_ALL}",
+        f"delete-contact [name]{Fore.GREEN} - Deletes a contact by name.{Style.RESET_ALL}",
+        f"delete-email [name]{Fore.GREEN} - Deletes the email of a contact.{Style.RESET_ALL}",
+        f"delete-phone [name] [phone number]{Fore.GREEN} - Deletes a specific phone number from a contact.{Style.RESET_ALL}",
+        f"close, exit, quit{Fore.GREEN} - Exits the program.{Style.RESET_ALL}",
+        f"help{Fore.GREEN} - Displays a list of available commands.{Style.RESET_ALL}",
+        "",
+        f"{Fore.CYAN}Example usage:{Style.RESET_ALL}",
+        f"add John 1234567890{Fore.GREEN} - Adds a contact named {Fore.CYAN}John{Fore.GREEN} with phone number {Fore.CYAN}1234567890.{Style.RESET_ALL}",
+        f"phone John{Fore.GREEN} - Shows the phone number of {Fore.CYAN}John.{Fore.GREEN}\n",
+    ]
+) + "\n"
+
+
+def help_command(*_: str) -> None:
     """Display the help information with available commands."""
-    print(f"{Fore.GREEN}This bot helps you manage your contacts.{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}You can use the following commands:{Style.RESET_ALL}")
-    print(f"hello{Fore.GREEN} - Greets the user.{Style.RESET_ALL}")
-    print(
-        f"add [name] [phone number]{Fore.GREEN} - Adds a new contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"change [name] [new phone number]{Fore.GREEN} - Changes the phone number of an existing contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"phone [name]{Fore.GREEN} - Shows the phone number of a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"add-phone [name] [phone number]{Fore.GREEN} - Adds an additional phone to a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"add-email [name] [email]{Fore.GREEN} - Adds an email to a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"edit-email [name] [new email]{Fore.GREEN} - Edits the email of a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"email [name]{Fore.GREEN} - Show the email of a contact.{Style.RESET_ALL}"
-    )
+    sys.stdout.write(_HELP_TEXT)
 
-    print(f"add-address [name] [address]{Fore.GREEN} - Adds an address to a contact.{Style.RESET_ALL}"
-    )
-    print(f"edit-address [name] [address]{Fore.GREEN} - Edits the address of a contact{Style.RESET_ALL}"
-    )
-    print(f"all{Fore.GREEN} - Shows all contacts.{Style.RESET_ALL}")
 
-    print(
-        f"add-birthday [name] [birthday]{Fore.GREEN} - Adds a birthday to a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"show-birthday [name]{Fore.GREEN} - Shows the birthday of a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"birthdays [number of days]{Fore.GREEN} - Shows upcoming birthdays in a set amount of days.{Style.RESET_ALL}"
-    )
-    print(
-        f"delete-contact [name]{Fore.GREEN} - Deletes a contact by name.{Style.RESET_ALL}"
-    )
-    print(
-        f"delete-email [name]{Fore.GREEN} - Deletes the email of a contact.{Style.RESET_ALL}"
-    )
-    print(
-        f"delete-phone [name] [phone number]{Fore.GREEN} - Deletes a specific phone number from a contact.{Style.RESET_ALL}"
-    )
-    print(f"close, exit, quit{Fore.GREEN} - Exits the program.{Style.RESET_ALL}")
-    print(f"help{Fore.GREEN} - Displays a list of available commands.{Style.RESET_ALL}")
-    print()
-    print(f"{Fore.CYAN}Example usage:{Style.RESET_ALL}")
-    print(
-        f"add John 1234567890{Fore.GREEN} - Adds a contact named {Fore.CYAN}John{Fore.GREEN} with phone number {Fore.CYAN}1234567890.{Style.RESET_ALL}"
-    )
-    print(
-        f"phone John{Fore.GREEN} - Shows the phone number of {Fore.CYAN}John.{Fore.GREEN}\n"
-    )
+_BANNER = """
+     _               _       _                 _     ____          _                ____  
+    / \\    ___  ___ (_) ___ | |_  __ _  _ __  | |_  | __ )   ___  | |_    __   __  |___ \\ 
+   / _ \\  / __|/ __|| |/ __|| __|/ _` || '_ \\ | __| |  _ \\  / _ \\ | __|   \\ \\ / /    __) |
+  / ___ \\ \\__ \\\\__ \\| |\\__ \\| |_| (_| || | | || |_  | |_) || (_) || |_     \\ V /_   / __/ 
+ /_/   \\_\\|___/|___/|_||___/ \\__|\\__,_||_| |_| \\__| |____/  \\___/  \\__|     \\_/(_) |_____|
+                                                                                          
+"""
+
+# The start-up banner and greeting, written in a single call.
+_WELCOME = (
+    f"{Fore.GREEN}{_BANNER}{Style.RESET_ALL}\n\n"
+    f"{Fore.CYAN}{Style.BRIGHT}Welcome to the Assistant Bot ver. 2.3 !{Style.RESET_ALL}\n\n"
+)
 
 
 def main():
     """Main function that runs the command line interface for an assistant bot."""
     address_book = load_data()  # Load the address book from the file
-    command_handlers: Dict[str, Callable[[Optional[List[str]]], None]] = {
-        "hello": lambda _: hello(),
-        "add": lambda args: add_contact(address_book, *args),
-        "change": lambda args: change_contact(address_book, *args),
-        "phone": lambda args: show_phone(address_book, *args),
-        "add-phone": lambda args: add_phone_to_contact(address_book, *args),
-        "add-email": lambda args: add_email_to_contact(address_book, *args),
-        "edit-email": lambda args: edit_email_of_contact(address_book, *args),
-        "add-address": lambda args: add_address_to_contact(address_book, *args),
-        "edit-address": lambda args: edit_address_of_contact(address_book, *args),
-        "add-birthday": lambda args: add_birthday(address_book, *args),
-        "show-birthday": lambda args: show_birthday(address_book, *args),
-        "birthdays": lambda _: birthdays(address_book, *args),
-        "email": lambda args: show_email(address_book, *args),
-        "all": lambda _: show_all_contacts(address_book),
-        "delete-contact": lambda args: delete_contact(address_book, *args),
-        "delete-email": lambda args: delete_email_from_contact(address_book, *args),
-        "delete-phone": lambda args: delete_phone_from_contact(address_book, args[0], args[1]),
-        "close": lambda _: handle_exit(address_book),
-        "exit": lambda _: handle_exit(address_book),
-        "quit": lambda _: handle_exit(address_book),
-        "help": lambda _: help_command(),
+    # Handlers are bound to the address book once, so a command is a single
+    # call with the arguments unpacked rather than a lambda around the call.
+    exit_handler = partial(handle_exit, address_book)
+    command_handlers: Dict[str, Callable[..., None]] = {
+        "hello": hello,
+        "add": partial(add_contact, address_book),
+        "change": partial(change_contact, address_book),
+        "phone": partial(show_phone, address_book),
+        "add-phone": partial(add_phone_to_contact, address_book),
+        "add-email": partial(add_email_to_contact, address_book),
+        "edit-email": partial(edit_email_of_contact, address_book),
+        "add-address": partial(add_address_to_contact, address_book),
+        "edit-address": partial(edit_address_of_contact, address_book),
+        "add-birthday": partial(add_birthday, address_book),
+        "show-birthday": partial(show_birthday, address_book),
+        "birthdays": partial(birthdays, address_book),
+        "email": partial(show_email, address_book),
+        "all": partial(show_all_contacts, address_book),
+        "delete-contact": partial(delete_contact, address_book),
+        "delete-email": partial(delete_email_from_contact, address_book),
+        "delete-phone": partial(delete_phone_from_contact, address_book),
+        "close": exit_handler,
+        "exit": exit_handler,
+        "quit": exit_handler,
+        "help": help_command,
     }
 
-    init(autoreset=True)  # Initialize colorama
+    if sys.stdout.isatty():
+        init(autoreset=True)  # Initialize colorama
 
-    banner_part_1 = """
-     _               _       _                 _     ____          _                ____  
-    / \\    ___  ___ (_) ___ | |_  __ _  _ __  | |_  | __ )   ___  | |_    __   __  |___ \\ 
-   / _ \\  / __|/ __|| |/ __|| __|/ _` || '_ \\ | __| |  _ \\  / _ \\ | __|   \\ \\ / /    __) |
-  / ___ \\ \\__ \\\\__ \\| |\\__ \\| |_| (_| || | | || |_  | |_) || (_) || |_     \\ V /_   / __/ 
- /_/   \\_\\|___/|___/|_||___/ \\__|\\__,_||_| |_| \\__| |____/  \\___/  \\__|     \\_/(_) |_____|
-                                                                                          
-"""
-    print(f"{Fore.GREEN}{banner_part_1}{Style.RESET_ALL}")
-    print()
-    print(
-        f"{Fore.CYAN}{Style.BRIGHT}Welcome to the Assistant Bot ver. 2.3 !{Style.RESET_ALL}"
-    )
-    print()
+    sys.stdout.write(_WELCOME)
     help_command()
 
-    while True:
-        user_input = input(f"{Fore.YELLOW}Enter a command: {Style.RESET_ALL}").strip()
+    # Scripted input is read line by line without printing and flushing a
+    # prompt for every command.
+    lines = prompt_lines() if sys.stdin.isatty() else sys.stdin
+    for user_input in lines:
         command, args = parse_input(user_input)
         handle_command(command_handlers, command, args)
 
 
+def prompt_lines() -> Iterator[str]:
+    """Yield commands typed at the interactive prompt."""
+    while True:
+        yield input(f"{Fore.YELLOW}Enter a command: {Style.RESET_ALL}")
+
+
 if __name__ == "__main__":
     main()
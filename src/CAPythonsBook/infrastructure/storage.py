@@ -1,42 +1,108 @@
+import hashlib
 import json
+import os
+import threading
 import uuid
-from typing import Dict
-from app.entities import Record, Name, Field
+from typing import Any, Dict, Optional, Tuple
+from app.entities import AddressBook, Record, Name, Field, Birthday
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data: Any) -> bytes:
+    # Both paths write the same 2-space layout (the only indent orjson offers),
+    # so the file does not depend on which one is installed.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _loads(payload: bytes) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def write_atomic(file_path: str, payload: bytes) -> None:
+    """Writes via a temporary file so a failed write never truncates the target."""
+    # Unique per thread, so a background save and a foreground one never share
+    # a temporary file.
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(payload)
+    os.replace(tmp_path, file_path)
+
+
+# Stored fields rebuilt as their own type on load; every other field is kept as
+# a plain Field (Address, for one, is built from its parts, not the joined text).
+_FIELD_CLASSES: Dict[str, type] = {"birthday": Birthday}
+
+
+def _load_field(record_name: str, field_name: str, value: Any) -> Field:
+    field_class = _FIELD_CLASSES.get(field_name, Field)
+    try:
+        return field_class(value)
+    except ValueError as e:
+        # A value that no longer validates is kept as text rather than
+        # stopping the whole book from loading.
+        print(f"Invalid {field_name} '{value}' for {record_name}: {e}")
+        return Field(value)
 
 
 class FileStorage:
     def __init__(self, file_path: str):
         self.file_path = file_path
+        self._saved_digest = None
 
-    def save_contacts(self, contacts: Dict[uuid.UUID, Record]) -> None:
+    def _serialize(
+        self, contacts: Dict[uuid.UUID, Record]
+    ) -> Optional[Tuple[bytes, bytes]]:
+        # Returns the payload and its digest, or None when the payload matches
+        # the last one written.
         data = {
             str(record_id): record.to_dict() for record_id, record in contacts.items()
         }
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        payload = _dumps(data)
+        # The book is saved after every command; skip the write when nothing
+        # has changed since the last one.
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == self._saved_digest and os.path.exists(self.file_path):
+            return None
+        return payload, digest
+
+    def save_contacts(self, contacts: Dict[uuid.UUID, Record]) -> None:
+        serialized = self._serialize(contacts)
+        if serialized is not None:
+            payload, digest = serialized
+            write_atomic(self.file_path, payload)
+            # Recorded only once the write succeeded, so a failed save is
+            # retried next time even if nothing else changes.
+            self._saved_digest = digest
 
     def load_contacts(self) -> Dict[uuid.UUID, Record]:
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
+            with open(self.file_path, "rb") as file:
+                data = _loads(file.read())
             contacts = {}
             for record_id, fields in data.items():
                 name = Name(fields.pop("name"))
                 record = Record(name)
                 record.id = uuid.UUID(record_id)
                 for field_name, field_value in fields.items():
-                    # print(type(field_value))
-                    field_class = globals().get(field_name.capitalize(), Field)
                     if type(field_value) == list:
-                        list_of_object = [field_class(items) for items in field_value]
+                        list_of_object = [
+                            _load_field(name.value, field_name, items)
+                            for items in field_value
+                        ]
                         record.fields[field_name] = list_of_object
-                    # if field_name == "phones":
-                    #     phones = [Phone(phone) for phone in field_value]
-                    #     record.fields["phones"] = phones
-                    # elif field_name == "phones"
                     else:
-                        field_class = globals().get(field_name.capitalize(), Field)
-                        record.fields[field_name] = field_class(field_value)
+                        record.fields[field_name] = _load_field(
+                            name.value, field_name, field_value
+                        )
                 contacts[record.id] = record
             return contacts
         except FileNotFoundError:
@@ -44,3 +110,50 @@ class FileStorage:
         except json.JSONDecodeError as e:
             print(f"Error decoding JSON: {e}")
             return {}
+
+
+class PersistenceWorker(threading.Thread):
+    """
+    Saves the address book from a background thread, only after it has
+    changed and at most once per `delay` seconds. Anything that reads or
+    mutates the book while the worker runs must hold `lock`.
+    """
+
+    def __init__(self, storage: FileStorage, address_book: AddressBook, delay=0.5):
+        super().__init__(daemon=True)
+        self.storage = storage
+        self.address_book = address_book
+        self.delay = delay
+        self.lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._closing = threading.Event()
+        self._saved_version = address_book.version
+
+    def notify(self) -> None:
+        """Schedules a save if the book changed since the last one."""
+        if self.address_book.version != self._saved_version:
+            self._dirty.set()
+
+    def run(self) -> None:
+        while not self._closing.is_set():
+            self._dirty.wait()
+            self._dirty.clear()
+            # Commands typed in quick succession end up in a single save.
+            if self._closing.wait(self.delay):
+                break
+            self._save()
+
+    def _save(self) -> None:
+        with self.lock:
+            version = self.address_book.version
+            if version != self._saved_version:
+                self.storage.save_contacts(self.address_book)
+                self._saved_version = version
+
+    def flush_and_join(self) -> None:
+        """Stops the worker and writes any change it has not saved yet."""
+        self._closing.set()
+        self._dirty.set()
+        if self.is_alive():
+            self.join()
+        self._save()
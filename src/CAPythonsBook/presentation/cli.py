@@ -1,21 +1,24 @@
 import os
 import sys
+import threading
 
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
-from typing import List, Tuple, Type
+from typing import List, Optional, Sequence, Tuple, Type
 
-import difflib
 import string
-from colorama import Fore, Style, init
+from functools import lru_cache
+from itertools import islice
+from presentation.colors import Fore, Style
 from prompt_toolkit import PromptSession
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.completion import Completer, Completion, ThreadedCompleter
 from prompt_toolkit.document import Document
 from prompt_toolkit.formatted_text import HTML
 
-from app.command_registry import command_registry
+from app.command_registry import command_names, command_registry
 from app.entities import (
+    FIELD_KEYS,
     FIELD_TYPES,
     AddressBook,
     Birthday,
@@ -28,24 +31,105 @@ from app.entities import (
 from app.interfaces import Command
 from app.services import handle_command
 from app.settings import Settings
-from infrastructure.storage import FileStorage
+from app.trie import Trie
+from infrastructure.storage import FileStorage, PersistenceWorker
 from presentation.messages import Message
 
+# Typing one of these moves completion on to the next argument.
+_DELIMS = frozenset(string.punctuation + string.whitespace)
+
+_DID_YOU_MEAN = f"{Fore.YELLOW}Did you mean:{Style.RESET_ALL}\n"
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
+
+
+def close_matches(word: str, choices, n: int, cutoff: float) -> List[str]:
+    """Return up to n fuzzy matches for word, best first; cutoff is 0..1."""
+    if process is not None:
+        return [
+            match
+            for match, _, _ in process.extract(
+                word, choices, scorer=fuzz.WRatio, limit=n, score_cutoff=cutoff * 100
+            )
+        ]
+    return list(_difflib_matches(word, tuple(choices), n, cutoff))
+
+
+@lru_cache(maxsize=256)
+def _difflib_matches(
+    word: str, choices: Tuple[str, ...], n: int, cutoff: float
+) -> Tuple[str, ...]:
+    # prompt_toolkit asks for completions several times per keystroke and the
+    # candidates rarely change, so the slow pure-Python scoring is memoised.
+    import difflib
+
+    return tuple(difflib.get_close_matches(word, choices, n=n, cutoff=cutoff))
+
 
 class CommandCompleter(Completer):
-    def __init__(self, address_book: AddressBook):
+    def __init__(
+        self, address_book: AddressBook, lock: Optional[threading.Lock] = None
+    ):
         self.address_book = address_book
-        self.current_completions: List[str] = list(command_registry.keys())
+        # Completions run on a worker thread; this is the lock that commands
+        # hold while they change the book.
+        self._lock = lock if lock is not None else threading.Lock()
+        self.current_completions: Sequence[str] = command_names()
+        # Prefix tree matching current_completions, if there is one for them.
+        self.current_trie: Optional[Trie] = None
+        self._command_trie: Optional[Trie] = None
+        self._command_trie_names: Tuple[str, ...] = ()
+        self._name_trie: Optional[Trie] = None
+        self._name_trie_version = -1
+        self._completions_key = None
+        # Completions for the last (text, book version) asked about.
+        self._last_completions: Tuple[object, List[Completion]] = (None, [])
+
+    def command_trie(self) -> Trie:
+        names = command_names()
+        if self._command_trie is None or self._command_trie_names is not names:
+            self._command_trie = Trie()
+            for command_name in names:
+                self._command_trie.insert(command_name, command_name)
+            self._command_trie_names = names
+        return self._command_trie
+
+    def name_trie(self) -> Trie:
+        # Rebuilt only after the address book has changed.
+        version = self.address_book.version
+        if self._name_trie is None or self._name_trie_version != version:
+            self._name_trie = Trie()
+            for record in self.address_book.values():
+                name = record.name.value
+                self._name_trie.insert(name, name)
+            self._name_trie_version = version
+        return self._name_trie
 
     def update_completions(self, command: str = "", args: List[str] = []):
         """Update the list of completions based on the current command and arguments."""
-        if command not in command_registry:
-            self.current_completions = list(command_registry.keys())
+        # prompt_toolkit asks again on every keystroke; the suggestions only
+        # change with the argument position, the contact or the book itself.
+        key = (
+            command,
+            len(args),
+            args[0] if len(args) > 1 else None,
+            self.address_book.version,
+        )
+        if key == self._completions_key:
             return
-
-        command_class = command_registry[command]
-        if not hasattr(command_class, "expected_fields"):
-            self.current_completions = list(command_registry.keys())
+        self._completions_key = key
+        self.current_trie = None
+        command_class = command_registry.get(command)
+        if command_class is None or not hasattr(command_class, "expected_fields"):
+            # Command names complete the command itself, never its arguments.
+            if args:
+                self.current_completions = []
+            else:
+                self.current_completions = command_names()
+                self.current_trie = self.command_trie()
             return
 
         field_index = len(args)
@@ -60,17 +144,16 @@ class CommandCompleter(Completer):
 
         if field_index == 1:
             # Suggestions for the first argument (contact name)
-            self.current_completions = [
-                record.fields["name"].value for record in self.address_book.values()
-            ]
+            self.current_completions = self.address_book.field_values("name")
+            self.current_trie = self.name_trie()
         elif field_index > 1 and issubclass(field_type, Field):
             contact_name = args[0] if args else ""
             contact = self.address_book.find_by_name(Name(contact_name))
             if contact:
-                self.current_completions = [
-                    field.value
-                    for field in contact.fields.get(field_type.__name__.lower(), [])
-                ]
+                values = contact.fields.get(FIELD_KEYS.get(field_type))
+                if isinstance(values, Field):
+                    values = [values]
+                self.current_completions = [field.value for field in values or ()]
             else:
                 self.current_completions = []
         else:
@@ -79,50 +162,66 @@ class CommandCompleter(Completer):
     def get_field_values(self, field_type: Type) -> List[str]:
         """Retrieve possible field values based on the field type."""
         if field_type == Name:
-            return [
-                record.fields["name"].value for record in self.address_book.values()
-            ]
+            return self.address_book.field_values("name")
         elif field_type == Phone:
-            return [
-                phone.value
-                for record in self.address_book.values()
-                for phone in record.fields.get("phones", [])
-            ]
+            return self.address_book.field_values("phones")
         elif field_type == Birthday:
-            return [
-                record.fields["birthday"].value
-                for record in self.address_book.values()
-                if "birthday" in record.fields
-            ]
+            return self.address_book.field_values("birthday")
         elif field_type == Email:
-            return [
-                email.value
-                for record in self.address_book.values()
-                for email in record.fields.get("emails", [])
-            ]
+            return self.address_book.field_values("emails")
         # Add other fields as needed
         return []
 
     def get_completions(self, document: Document, complete_event):
         """Generate completions based on the current input."""
-        text = document.text_before_cursor
-        words = text.split()
-        command = words[0] if words else ""
+        # prompt_toolkit may ask several times for the same text.
+        with self._lock:
+            key = (document.text_before_cursor, self.address_book.version)
+            cached_key, completions = self._last_completions
+            if key != cached_key:
+                completions = list(self._completions_for(key[0]))
+                self._last_completions = (key, completions)
+        yield from completions
+
+    def _completions_for(self, text: str):
+        command, args, at_delimiter = tokenize(text)
+        words = [command, *args] if command else []
         # Switch to the next argument if the user has typed a delimiter
-        if text and text[-1] in string.punctuation + string.whitespace:
+        if at_delimiter:
             words.append(" ")
-        args = words[1:] if len(words) > 1 else []
+        args = words[1:]
 
         if command:
             self.update_completions(command, args)
         else:
             self.update_completions()
 
-        if words:
+        if words and not words[-1].strip():
+            # A delimiter was just typed: offer everything for the new argument.
+            for completion in self.current_completions:
+                yield Completion(completion, start_position=0)
+        elif words:
             current_word = words[-1]
-            matches = difflib.get_close_matches(
-                current_word, self.current_completions, n=5, cutoff=0.1
-            )
+            prefix = current_word.lower()
+            # Words that start with what was typed need no scoring; fuzzy
+            # matching is only the fallback when there are none.
+            if self.current_trie is not None:
+                matches = list(islice(self.current_trie.iter_prefix(prefix), 5))
+            else:
+                matches = list(
+                    islice(
+                        (
+                            completion
+                            for completion in self.current_completions
+                            if completion.lower().startswith(prefix)
+                        ),
+                        5,
+                    )
+                )
+            if not matches:
+                matches = close_matches(
+                    current_word, self.current_completions, n=5, cutoff=0.1
+                )
             for match in matches:
                 yield Completion(match, start_position=-len(current_word))
         else:
@@ -130,11 +229,19 @@ class CommandCompleter(Completer):
                 yield Completion(completion, start_position=0)
 
 
+def tokenize(text: str) -> Tuple[str, List[str], bool]:
+    """Split input into the command, its arguments and a trailing-delimiter flag."""
+    # The command is split off at the first run of any whitespace; only the
+    # rest is split into arguments.
+    parts = text.split(None, 1)
+    command = parts[0] if parts else ""
+    args = parts[1].split() if len(parts) > 1 else []
+    return command, args, bool(text) and text[-1] in _DELIMS
+
+
 def parse_input(user_input: str) -> Tuple[str, list[str]]:
     """Parse the user input into a command and arguments."""
-    parts = user_input.split()
-    command = parts[0] if parts else ""
-    args = parts[1:] if len(parts) > 1 else []
+    command, args, _ = tokenize(user_input)
     return command, args
 
 
@@ -145,6 +252,8 @@ def main():
     )  # Load the address book from the file
     notes_book = NotesBook()  # Initialize NotesBook
 
+    from colorama import init
+
     init(autoreset=True)  # Initialize colorama
 
     # Initialize settings and load templates
@@ -170,10 +279,31 @@ def main():
     # Call the help command to display available commands
     handle_command("help", address_book, notes_book)
 
+    # Saves in the background after commands that changed the book.
+    persistence = PersistenceWorker(storage, address_book)
+
     session = PromptSession(
-        completer=CommandCompleter(address_book), auto_suggest=AutoSuggestFromHistory()
+        # Completion runs in a worker thread so typing never waits on it; it
+        # shares the persistence lock so it never sees a half-applied command.
+        completer=ThreadedCompleter(
+            CommandCompleter(address_book, lock=persistence.lock)
+        ),
+        auto_suggest=AutoSuggestFromHistory(),
     )
 
+    persistence.start()
+    try:
+        run_prompt_loop(session, persistence, address_book, notes_book)
+    finally:
+        persistence.flush_and_join()
+
+
+def run_prompt_loop(
+    session: PromptSession,
+    persistence: PersistenceWorker,
+    address_book: AddressBook,
+    notes_book: NotesBook,
+) -> None:
     while not Command.exit_command_flag:
         enter_command_prompt = Message.format_message("enter_command")
         try:
@@ -184,19 +314,19 @@ def main():
 
             # Check if the command is not found and suggest closest matches
             if command not in command_registry:
-                suggestions = difflib.get_close_matches(
-                    command, command_registry.keys()
+                suggestions = close_matches(
+                    command, command_names(), n=3, cutoff=0.6
                 )
                 if suggestions:
-                    print(f"{Fore.YELLOW}Did you mean:{Style.RESET_ALL}")
-                    for suggestion in suggestions:
-                        print(f"  {suggestion}")
+                    sys.stdout.write(
+                        _DID_YOU_MEAN + "".join(f"  {s}\n" for s in suggestions)
+                    )
+                    sys.stdout.flush()
                     continue
 
-            handle_command(command, address_book, notes_book, *args)
-            storage.save_contacts(
-                address_book
-            )  # Save the contacts after handling the command
+            with persistence.lock:
+                handle_command(command, address_book, notes_book, *args)
+            persistence.notify()
         except (EOFError, KeyboardInterrupt):
             break
         except Exception as e:
@@ -0,0 +1,14 @@
+import sys
+
+# Colour codes only make sense on a terminal. When output is piped or
+# redirected, every Fore/Style attribute is an empty string, so the escape
+# sequences are never built or written at all.
+if sys.stdout is not None and sys.stdout.isatty():
+    from colorama import Fore, Style
+else:
+
+    class _NoColor:
+        def __getattr__(self, name: str) -> str:
+            return ""
+
+    Fore = Style = _NoColor()
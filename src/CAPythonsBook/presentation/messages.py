@@ -1,6 +1,6 @@
 import json
 import os
-from colorama import Fore, Style
+from presentation.colors import Fore, Style
 
 
 class Message:
@@ -51,11 +51,10 @@ class Message:
         # print(cls.templates.get('note_added'))
         template = cls.templates.get(
             template_name, "Message template not found")
+        colors = cls.colors
+        param, after = colors["param"], colors["reset"] + colors["info"]
         formatted_message = template.format(
-            **{
-                k: f"{cls.colors['param']}{v}{cls.colors['reset']}{cls.colors['info']}"
-                for k, v in kwargs.items()
-            }
+            **{k: f"{param}{v}{after}" for k, v in kwargs.items()}
         )
         return formatted_message
 
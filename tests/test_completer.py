@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+
+# Додавання теки з кодом застосунку до sys.path
+APP_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "CAPythonsBook")
+sys.path.append(os.path.abspath(APP_DIR))
+
+from prompt_toolkit.document import Document
+
+from app.entities import AddressBook, Birthday, Record, Name, Phone
+from presentation.cli import CommandCompleter
+
+
+class TestCommandCompleter(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small address book for the completer."""
+        self.book = AddressBook()
+        for name, phone in (("John", "1234567890"), ("Jane", "9876543210")):
+            record = Record(Name(name))
+            record.add_phone(Phone(phone))
+            self.book.add_record(record)
+        self.completer = CommandCompleter(self.book)
+
+    def complete(self, text):
+        return [
+            completion.text
+            for completion in self.completer.get_completions(Document(text), None)
+        ]
+
+    def test_contact_phones_after_name(self):
+        """After a command and a contact, only that contact's phones are offered."""
+        self.assertEqual(self.complete("edit-phone John "), ["1234567890"])
+        self.assertEqual(self.complete("edit-phone Jane "), ["9876543210"])
+
+    def test_single_field_after_name(self):
+        """Single-valued fields such as a birthday are offered as well."""
+        john = self.book.find_by_name(Name("John"))
+        john.add_field("birthday", Birthday("01.02.2000"))
+        self.assertEqual(self.complete("edit-birthday John "), ["01.02.2000"])
+        self.assertEqual(self.complete("edit-birthday Jane "), [])
+
+    def test_phone_suggestions_follow_edits(self):
+        """A phone added to the contact is offered on the next completion."""
+        self.assertEqual(self.complete("edit-phone John "), ["1234567890"])
+        self.book.find_by_name(Name("John")).add_phone(Phone("5555555555"))
+        self.assertEqual(
+            self.complete("edit-phone John "), ["1234567890", "5555555555"]
+        )
+
+    def test_contact_names_after_command(self):
+        """After a command that takes a name, contact names are suggested."""
+        self.assertEqual(sorted(self.complete("add ")), ["Jane", "John"])
+
+    def test_name_prefix(self):
+        """A typed prefix narrows the contact names."""
+        self.assertEqual(self.complete("add-phone Jo"), ["John"])
+
+    def test_new_contact_is_suggested(self):
+        """Contacts added later show up in the suggestions."""
+        self.assertEqual(self.complete("add-phone Jo"), ["John"])
+        self.book.add_record(Record(Name("Joanna")))
+        self.assertEqual(sorted(self.complete("add-phone Jo")), ["Joanna", "John"])
+        self.assertIn("Joanna", self.complete("add "))
+
+    def test_any_whitespace_separates_the_command(self):
+        """Tabs and non-breaking spaces end the command like a space does."""
+        self.assertEqual(self.complete("add-phone\tJo"), ["John"])
+        self.assertEqual(self.complete("add-phone\u00a0Jo"), ["John"])
+
+    def test_command_prefix(self):
+        """Command names are completed from their prefix."""
+        self.assertEqual(self.complete("add-p"), ["add-phone"])
+        self.assertIn("search-notes", self.complete("sea"))
+
+    def test_fuzzy_fallback(self):
+        """A misspelt name is still matched when no name starts with it."""
+        self.assertIn("John", self.complete("add-phone Jhon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
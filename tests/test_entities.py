@@ -0,0 +1,192 @@
+import copy
+import pickle
+import unittest
+import sys
+import os
+
+# Додавання теки з кодом застосунку до sys.path
+APP_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "CAPythonsBook")
+sys.path.append(os.path.abspath(APP_DIR))
+
+from app.entities import Address, AddressBook, Birthday, Email, Name, Phone, Record
+
+
+class TestRecordCopies(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a record with every kind of field."""
+        self.record = Record(Name("John"))
+        self.record.add_phone(Phone("1234567890"))
+        self.record.add_email(Email("john@example.com"))
+        self.record.fields["birthday"] = Birthday("01.02.2000")
+        self.record.fields["address"] = Address(["Kyiv", "Main St 1"])
+
+    def assert_same_record(self, copied):
+        self.assertEqual(str(copied), str(self.record))
+        self.assertEqual(
+            copied.fields["birthday"].date, self.record.fields["birthday"].date
+        )
+        self.assertEqual(copied.fields["phones"], self.record.fields["phones"])
+
+    def test_pickle_round_trip(self):
+        """A record with pooled fields survives pickling."""
+        self.assert_same_record(pickle.loads(pickle.dumps(self.record)))
+
+    def test_deepcopy(self):
+        """A record with pooled fields can be deep-copied."""
+        self.assert_same_record(copy.deepcopy(self.record))
+
+    def test_name_copies_share_the_pooled_instance(self):
+        """Copied names come back as the pooled instance for that name."""
+        name = self.record.name
+        self.assertIs(pickle.loads(pickle.dumps(name)), name)
+        self.assertIs(copy.deepcopy(name), name)
+        self.assertIs(copy.copy(name), name)
+
+
+class TestAddressBookMutations(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a book with two contacts."""
+        self.book = AddressBook()
+        self.john = Record(Name("John"))
+        self.john.add_phone(Phone("1234567890"))
+        self.jane = Record(Name("Jane"))
+        self.book.add_record(self.john)
+        self.book.add_record(self.jane)
+
+    def test_pop_updates_name_index(self):
+        """pop() drops the contact from name lookups and bumps the version."""
+        version = self.book.version
+        self.assertIs(self.book.pop(self.john.id), self.john)
+        self.assertIsNone(self.book.find_by_name(Name("John")))
+        self.assertGreater(self.book.version, version)
+        self.assertIsNone(self.book.pop(self.john.id, None))
+        with self.assertRaises(KeyError):
+            self.book.pop(self.john.id)
+
+    def test_popitem_and_clear(self):
+        """popitem() and clear() keep the name index in step."""
+        record_id, record = self.book.popitem()
+        self.assertEqual((record_id, record), (self.jane.id, self.jane))
+        self.assertIsNone(self.book.find_by_name(Name("Jane")))
+        self.book.clear()
+        self.assertIsNone(self.book.find_by_name(Name("John")))
+        self.assertEqual(self.book.field_values("name"), [])
+
+    def test_update_and_setdefault(self):
+        """update() and setdefault() index the records they add."""
+        other = AddressBook()
+        other.update({self.john.id: self.john})
+        self.assertIs(other.find_by_name(Name("John")), self.john)
+        self.assertIs(other.setdefault(self.jane.id, self.jane), self.jane)
+        self.assertIs(other.find_by_name(Name("Jane")), self.jane)
+        self.assertEqual(other.search("123"), [self.john])
+
+        # The source book still follows the records it shares with `other`.
+        self.assertEqual(self.book.field_values("phones"), ["1234567890"])
+        self.assertEqual(self.book.search("555"), [])
+        version = self.book.version
+        self.john.add_phone(Phone("5555555555"))
+        self.jane.add_phone(Phone("5555555556"))
+        self.assertEqual(self.book.version, version + 2)
+        self.assertEqual(
+            self.book.field_values("phones"),
+            ["1234567890", "5555555555", "5555555556"],
+        )
+        self.assertEqual(self.book.search("555"), [self.john, self.jane])
+        self.assertIn("5555555556", str(self.book))
+
+    def test_shared_record_updates_every_book(self):
+        """A record held by two books invalidates the caches of both."""
+        other = AddressBook()
+        other[self.john.id] = self.john
+        before = str(self.book), str(other)
+        self.assertEqual(self.book.search("555"), [])
+        versions = self.book.version, other.version
+        self.john.add_phone(Phone("5555555555"))
+        self.assertGreater(self.book.version, versions[0])
+        self.assertGreater(other.version, versions[1])
+        self.assertNotEqual(str(self.book), before[0])
+        self.assertNotEqual(str(other), before[1])
+        self.assertEqual(self.book.search("555"), [self.john])
+        self.assertEqual(other.search("555"), [self.john])
+        self.book.rename(self.john, Name("Johnny"))
+        self.assertIs(other.find_by_name(Name("Johnny")), self.john)
+        self.assertIsNone(other.find_by_name(Name("John")))
+        del other[self.john.id]
+        self.john.add_phone(Phone("5555555556"))
+        self.assertIn("5555555556", self.book.field_values("phones"))
+
+    def test_pickle_round_trip(self):
+        """A pickled book keeps its records, name index and owners."""
+        copies = (pickle.loads(pickle.dumps(self.book)), copy.deepcopy(self.book))
+        for copied in copies:
+            self.assertEqual(list(copied), list(self.book))
+            john = copied.find_by_name(Name("John"))
+            self.assertEqual(str(john), str(self.john))
+            version = copied.version
+            john.add_phone(Phone("5555555555"))
+            self.assertGreater(copied.version, version)
+
+    def test_pickle_owned_record(self):
+        """A record can be pickled on its own while it belongs to a book."""
+        copied = pickle.loads(pickle.dumps(self.john))
+        self.assertEqual(str(copied), str(self.john))
+        version = self.book.version
+        copied.add_phone(Phone("5555555555"))
+        self.assertEqual(self.book.version, version)
+
+
+class TestAddressBookSearch(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a book and run one search so its trigram index exists."""
+        self.book = AddressBook()
+        self.john = Record(Name("John"))
+        self.john.add_phone(Phone("1234567890"))
+        self.jane = Record(Name("Jane"))
+        self.jane.add_phone(Phone("1234509876"))
+        self.book.add_record(self.john)
+        self.book.add_record(self.jane)
+        self.assertEqual(self.book.search("12345"), [self.john, self.jane])
+
+    def assert_search(self, keyword, expected):
+        self.assertEqual(self.book.search(keyword), expected)
+        # Same answer as a plain scan of the book.
+        self.assertEqual(
+            [r for r in self.book.values() if keyword in r.search_blob()], expected
+        )
+
+    def test_added_record_is_found(self):
+        """A record added after the first search is found, in book order."""
+        joanna = Record(Name("Joanna"))
+        joanna.add_phone(Phone("1234555555"))
+        self.book.add_record(joanna)
+        self.assert_search("12345", [self.john, self.jane, joanna])
+        self.assert_search("joanna", [joanna])
+
+    def test_edited_record_is_reindexed(self):
+        """Edited fields are found and the old values are not."""
+        self.john.replace_phone(Phone("1234567890"), Phone("5550001111"))
+        self.assert_search("12345", [self.jane])
+        self.assert_search("55500", [self.john])
+        self.book.rename(self.jane, Name("Janet"))
+        self.assert_search("janet", [self.jane])
+
+    def test_deleted_record_is_not_found(self):
+        """Deleted and replaced records drop out of the results."""
+        self.book.delete(self.john.id)
+        self.assert_search("12345", [self.jane])
+        self.assert_search("john", [])
+        replacement = Record(Name("Jack"))
+        replacement.add_phone(Phone("1234599999"))
+        self.book[self.jane.id] = replacement
+        self.assert_search("12345", [replacement])
+        self.assert_search("jane", [])
+        self.jane.add_phone(Phone("1234577777"))
+        self.assert_search("1234577", [])
+
+
+if __name__ == "__main__":
+    unittest.main()
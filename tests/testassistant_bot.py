@@ -29,19 +29,19 @@ class TestAddressBook(unittest.TestCase):
         new_record.add_phone(Phone("1112223333"))
         self.book.add_record(new_record)
         self.assertTrue(
-            any(record.name.value == "Alice" for record in self.book.data.values())
+            any(record.name.value == "Alice" for record in self.book.values())
         )
 
     def test_delete_record(self):
         """Test removing a record from the address book."""
         jane_record_id = next(
             record.id
-            for record in self.book.data.values()
+            for record in self.book.values()
             if record.name.value == "Jane"
         )
         self.book.delete(jane_record_id)
         self.assertFalse(
-            any(record.name.value == "Jane" for record in self.book.data.values())
+            any(record.name.value == "Jane" for record in self.book.values())
         )
         with self.assertRaises(KeyError):
             self.book.delete(jane_record_id)